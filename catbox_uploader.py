@@ -1,17 +1,118 @@
 import requests
 import sys
 import os
+import time
+import uuid
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+
+from publish_trace import get_tracer
+from media_preprocess import get_preprocessor
+from upload_cache import get_cache
 
 CATBOX_UPLOAD_URL = "https://catbox.moe/user/api.php"
 
-def upload_file(file_path):
+# 다중 업로드 기본값: 동시 업로드 수, 파일별 재시도 횟수, 첫 재시도 대기(초)
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 1.0
+
+# 스트리밍 업로드 시 한 번에 읽어서 보내는 크기 (bytes)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class _MultipartFileStream:
+    """
+    multipart/form-data 본문을 파일 전체를 메모리에 올리지 않고 chunk_size 단위로 만들어 보내는 스트림.
+    __len__을 제공하므로 requests가 Content-Length를 설정하고 chunked 인코딩 없이 전송합니다.
+    """
+
+    def __init__(self, fields, file_field, file_path, chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        filename = os.path.basename(file_path).replace('"', '%22')
+        mime_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        head = b""
+        for name, value in fields.items():
+            head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                     f'{value}\r\n').encode("utf-8")
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+                 f'Content-Type: {mime_type}\r\n\r\n').encode("utf-8")
+        self._head = head
+        self._tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self.file_size = os.path.getsize(file_path)
+        self.total = len(self._head) + self.file_size + len(self._tail)
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        start = time.monotonic()
+        sent = 0
+
+        def report(chunk):
+            nonlocal sent
+            sent += len(chunk)
+            if self.progress_callback:
+                elapsed = max(time.monotonic() - start, 1e-6)
+                self.progress_callback(sent, self.total, sent / elapsed)
+            return chunk
+
+        yield report(self._head)
+        with open(self.file_path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield report(chunk)
+        yield report(self._tail)
+
+
+def _print_progress(file_path):
+    """기본 진행률 콜백: 10% 단위로 전송량과 속도를 출력합니다."""
+    last_step = [-1]
+
+    def callback(sent, total, throughput):
+        step = int(sent * 10 / total) if total else 10
+        if step != last_step[0]:
+            last_step[0] = step
+            print(f"      [Catbox] 전송 {sent * 100 // max(total, 1)}% ({sent}/{total} bytes, {throughput / 1024 / 1024:.2f} MB/s)")
+    return callback
+
+
+def upload_file(file_path, progress_callback=None, chunk_size=DEFAULT_CHUNK_SIZE, use_cache=True, verify_cache=False, preprocess=True):
     """
     Catbox.moe에 파일(이미지/동영상 등)을 업로드하고 URL을 반환합니다.
+    파일은 chunk_size 단위로 스트리밍 전송되므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+    progress_callback(bytes_sent, total_bytes, bytes_per_sec)을 주면 전송 진행 상황을 받을 수 있습니다.
+    use_cache=True면 같은 내용의 파일은 이전에 받은 URL을 재사용하고 업로드를 건너뜁니다.
+    (verify_cache=True면 재사용 전에 HEAD 요청으로 URL이 살아 있는지 확인)
+    media_preprocess.configure_preprocessor()로 전처리가 켜져 있으면 축소/재압축된 파일을 업로드합니다. (preprocess=False로 끌 수 있음)
     """
     print(f"      [Catbox] 파일 존재 확인: {file_path}")
     if not os.path.isfile(file_path):
         raise FileNotFoundError(f"파일이 존재하지 않습니다: {file_path}")
     
+    preprocessor = get_preprocessor() if preprocess else None
+    if preprocessor:
+        with get_tracer().span("preprocess", file=os.path.basename(file_path)) as record:
+            processed_path = preprocessor.process(file_path)
+            record["bytes_saved"] = os.path.getsize(file_path) - os.path.getsize(processed_path)
+        if processed_path != file_path:
+            print(f"      [Catbox] 전처리된 파일 사용: {processed_path} ({record['bytes_saved']} bytes 절약)")
+            file_path = processed_path
+    
+    cache = get_cache() if use_cache else None
+    if cache:
+        cached_url = cache.get(file_path, verify=verify_cache)
+        if cached_url:
+            print(f"      [Catbox] 캐시된 URL 재사용: {cached_url}")
+            return cached_url
+    
     print(f"      [Catbox] 파일 크기 확인...")
     file_size = os.path.getsize(file_path)
     print(f"      [Catbox] 파일 크기: {file_size} bytes")
@@ -19,45 +120,133 @@ def upload_file(file_path):
     print(f"      [Catbox] Catbox.moe API 호출 중...")
     print(f"      [Catbox] 업로드 URL: {CATBOX_UPLOAD_URL}")
     
-    with open(file_path, 'rb') as f:
-        files = {'fileToUpload': f}
-        data = {'reqtype': 'fileupload'}
-        response = requests.post(CATBOX_UPLOAD_URL, data=data, files=files, timeout=60)
-        
-        print(f"      [Catbox] 응답 상태 코드: {response.status_code}")
-        print(f"      [Catbox] 응답 내용: {response.text[:200]}...")
-        
-        response.raise_for_status()
-        url = response.text.strip()
-        
-        if url.startswith('http'):
-            print(f"      [Catbox] 업로드 성공! URL: {url}")
-            return url
-        else:
-            print(f"      [Catbox] 업로드 실패! 응답: {url}")
-            raise Exception(f"Catbox 업로드 실패: {url}")
-
-def upload_multiple(files):
+    body = _MultipartFileStream(
+        {'reqtype': 'fileupload'}, 'fileToUpload', file_path,
+        chunk_size=chunk_size, progress_callback=progress_callback or _print_progress(file_path))
+    tracer = get_tracer()
+    with tracer.span("upload", file=os.path.basename(file_path), bytes=file_size):
+        start = time.perf_counter()
+        try:
+            response = requests.post(CATBOX_UPLOAD_URL, data=body, headers={'Content-Type': body.content_type}, timeout=60)
+        except requests.exceptions.RequestException as e:
+            tracer.record_http("POST", CATBOX_UPLOAD_URL, None, time.perf_counter() - start, error=str(e))
+            raise
+        tracer.record_http("POST", CATBOX_UPLOAD_URL, response.status_code, time.perf_counter() - start,
+                           bytes_sent=len(body), bytes_received=len(response.content))
+    
+    print(f"      [Catbox] 응답 상태 코드: {response.status_code}")
+    print(f"      [Catbox] 응답 내용: {response.text[:200]}...")
+    
+    response.raise_for_status()
+    url = response.text.strip()
+    
+    if url.startswith('http'):
+        print(f"      [Catbox] 업로드 성공! URL: {url}")
+        if cache:
+            cache.put(file_path, url)
+        return url
+    else:
+        print(f"      [Catbox] 업로드 실패! 응답: {url}")
+        raise Exception(f"Catbox 업로드 실패: {url}")
+
+class UploadItem:
+    """파일 1개의 업로드 결과 (URL 또는 오류, 시도 횟수, 소요 시간)"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.url = None
+        self.error = None
+        self.attempts = 0
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return self.url is not None
+
+    def __repr__(self):
+        state = self.url if self.ok else f"실패: {self.error}"
+        return f"<UploadItem {self.file_path} {state} ({self.attempts}회, {self.elapsed:.2f}초)>"
+
+
+class UploadBatchResult:
+    """여러 파일 업로드 결과. items는 입력 순서를 그대로 유지합니다."""
+
+    def __init__(self, items, elapsed):
+        self.items = items
+        self.elapsed = elapsed
+
+    @property
+    def urls(self):
+        """성공한 파일의 URL 리스트 (입력 순서)"""
+        return [item.url for item in self.items if item.ok]
+
+    @property
+    def failed(self):
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def raise_for_failures(self):
+        """하나라도 실패했다면 실패 목록을 담은 예외를 발생시킵니다."""
+        if self.failed:
+            details = ", ".join(f"{item.file_path}: {item.error}" for item in self.failed)
+            raise Exception(f"Catbox 업로드 실패 {len(self.failed)}/{len(self.items)}개 - {details}")
+
+
+def _upload_with_retry(item, retries, backoff):
+    """업로드 실패 시 backoff, backoff*2, ... 초 간격으로 최대 retries번 재시도합니다."""
+    start = time.monotonic()
+    delay = backoff
+    with get_tracer().span("upload_with_retry", file=os.path.basename(item.file_path)) as record:
+        while True:
+            item.attempts += 1
+            try:
+                item.url = upload_file(item.file_path)
+                item.error = None
+                break
+            except FileNotFoundError as e:
+                item.error = e
+                break
+            except Exception as e:
+                item.error = e
+                if item.attempts > retries:
+                    break
+                print(f"      [Catbox] 업로드 재시도 {item.attempts}/{retries} ({delay:.1f}초 후): {item.file_path}")
+                time.sleep(delay)
+                delay *= 2
+        record["retries"] = item.attempts - 1
+        if not item.ok:
+            record["error"] = str(item.error)
+    item.elapsed = time.monotonic() - start
+    return item
+
+
+def upload_multiple(files, max_workers=DEFAULT_MAX_WORKERS, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
     """
-    여러 파일을 순차적으로 업로드하고, URL 리스트를 반환합니다.
+    여러 파일을 최대 max_workers개씩 동시에 업로드하고 UploadBatchResult를 반환합니다.
+    실패한 파일은 재시도 후에도 결과에 오류와 함께 남아 있으므로 result.failed로 확인할 수 있습니다.
     """
-    urls = []
-    for file_path in files:
-        print(f"업로드 중: {file_path}")
-        try:
-            url = upload_file(file_path)
-            print(f"  → 업로드 성공: {url}")
-            urls.append(url)
-        except Exception as e:
-            print(f"  → 업로드 실패: {e}")
-    return urls
+    items = [UploadItem(file_path) for file_path in files]
+    start = time.monotonic()
+    if items:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+            for item in executor.map(lambda i: _upload_with_retry(i, retries, backoff), items):
+                if item.ok:
+                    print(f"  → 업로드 성공: {item.file_path} → {item.url} ({item.elapsed:.2f}초)")
+                else:
+                    print(f"  → 업로드 실패: {item.file_path} ({item.error})")
+    return UploadBatchResult(items, time.monotonic() - start)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("사용법: python catbox_uploader.py 파일1 [파일2 ...]")
         sys.exit(1)
     file_list = sys.argv[1:]
-    result_urls = upload_multiple(file_list)
-    print("\n=== 업로드된 파일 URL 목록 ===")
-    for url in result_urls:
-        print(url) 
\ No newline at end of file
+    result = upload_multiple(file_list)
+    print(f"\n=== 업로드된 파일 URL 목록 ({result.elapsed:.2f}초) ===")
+    for item in result.items:
+        print(item.url if item.ok else f"[실패] {item.file_path}: {item.error}")
+    if not result.ok:
+        sys.exit(1)
@@ -0,0 +1,147 @@
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+
+SETTINGS_FILE = "settings.json"
+WINDOW_GEOMETRY_FILE = "window_geometry.json"
+
+# 마지막 변경 후 이 시간(초) 동안 추가 변경이 없으면 파일에 기록합니다.
+DEFAULT_DELAY = 0.5
+
+
+def write_json_atomic(path, data, indent=2):
+    """임시 파일에 먼저 쓴 뒤 이름을 바꿔서(os.replace) 저장 도중 종료되어도 파일이 깨지지 않게 합니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ConfigStore:
+    """
+    JSON 설정 파일 1개를 메모리에 들고 있는 저장소.
+    변경은 즉시 메모리에 반영되고, 짧은 시간 안의 연속 변경은 하나로 합쳐서 백그라운드 스레드가 한 번에 기록합니다.
+    """
+
+    def __init__(self, path, delay=DEFAULT_DELAY, indent=2):
+        self.path = path
+        self.delay = delay
+        self.indent = indent
+        self._data = self._read()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._deadline = 0.0
+        self._thread = None
+
+    def _read(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"설정 로드 실패({self.path}): {e}")
+        return {}
+
+    # --- 읽기 ---
+
+    def load(self):
+        """현재 설정의 복사본을 반환합니다. (파일을 다시 읽지 않음)"""
+        with self._cond:
+            return copy.deepcopy(self._data)
+
+    def get(self, key, default=None):
+        with self._cond:
+            return copy.deepcopy(self._data.get(key, default))
+
+    # --- 쓰기 (지연 저장) ---
+
+    def replace(self, data):
+        """설정 전체를 교체합니다."""
+        with self._cond:
+            self._data = copy.deepcopy(data)
+            self._schedule()
+
+    def update(self, values):
+        """일부 키만 갱신합니다."""
+        with self._cond:
+            self._data.update(copy.deepcopy(values))
+            self._schedule()
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def _schedule(self):
+        # self._cond를 잡은 상태에서 호출됩니다.
+        self._dirty = True
+        self._deadline = time.monotonic() + self.delay
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"ConfigStore({self.path})", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                remaining = self._deadline - time.monotonic()
+                while remaining > 0:
+                    self._cond.wait(remaining)
+                    remaining = self._deadline - time.monotonic()
+            self.flush()
+
+    def flush(self):
+        """대기 중인 변경이 있으면 지금 바로 파일에 기록합니다."""
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                snapshot = copy.deepcopy(self._data)
+                self._dirty = False
+            try:
+                write_json_atomic(self.path, snapshot, indent=self.indent)
+            except Exception as e:
+                print(f"설정 저장 실패({self.path}): {e}")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, indent=2, delay=DEFAULT_DELAY):
+    """path별로 하나씩 공유되는 ConfigStore를 반환합니다."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ConfigStore(path, delay=delay, indent=indent)
+            _stores[key] = store
+        return store
+
+
+def get_settings_store():
+    return get_store(SETTINGS_FILE, indent=4)
+
+
+def get_window_geometry_store():
+    return get_store(WINDOW_GEOMETRY_FILE, indent=4)
+
+
+@atexit.register
+def flush_all():
+    """프로그램 종료 시 아직 기록되지 않은 변경을 모두 저장합니다."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
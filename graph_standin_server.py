@@ -0,0 +1,255 @@
+"""
+오프라인 측정/회귀 테스트용 Threads Graph API + Catbox 대역(stand-in) 서버.
+
+지원 경로:
+    POST /v1.0/{user_id}/threads              컨테이너 생성 (TEXT/IMAGE/VIDEO/CAROUSEL, TEXT는 auto_publish_text 지원)
+    POST /v1.0/{user_id}/threads_publish      컨테이너 게시
+    GET  /v1.0/{container_id}?fields=status_code
+    GET  /v1.0/?ids=a,b,c&fields=status_code  다중 ID 상태 조회
+    GET  /v1.0/{user_id}/threads_publishing_limit
+    POST /user/api.php                        Catbox 업로드 (multipart)
+
+사용법:
+    python graph_standin_server.py --port 8765 --latency 50 --video-ms 3000 --error-subcode 4279009 --error-rate 0.1
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/v1.0"
+CATBOX_PATH = "/user/api.php"
+
+
+class StandinConfig:
+    """대역 서버 동작 설정. 시간 단위는 모두 밀리초입니다."""
+
+    def __init__(self, latency_ms=30, image_ms=200, video_ms=2000, carousel_ms=100,
+                 error_subcode=None, error_rate=0.0, quota_total=250, seed=None, auto_publish_text=True):
+        self.latency_ms = latency_ms
+        self.image_ms = image_ms
+        self.video_ms = video_ms
+        self.carousel_ms = carousel_ms
+        self.error_subcode = error_subcode
+        self.error_rate = error_rate
+        self.quota_total = quota_total
+        self.auto_publish_text = auto_publish_text
+        self.random = random.Random(seed)
+
+
+class _Container:
+    def __init__(self, container_id, media_type, ready_at, children=()):
+        self.id = container_id
+        self.media_type = media_type
+        self.ready_at = ready_at
+        self.children = list(children)
+        self.published = False
+
+    @property
+    def status(self):
+        if self.published:
+            return "PUBLISHED"
+        return "FINISHED" if time.monotonic() >= self.ready_at else "IN_PROGRESS"
+
+
+class StandinState:
+    """서버 전체가 공유하는 컨테이너/업로드/요청 수 상태"""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.ids = itertools.count(17800000000000000)
+        self.containers = {}
+        self.publish_count = {}
+        self.request_count = 0
+        self.upload_count = 0
+        self.upload_bytes = 0
+
+    def new_id(self):
+        return str(next(self.ids))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None  # make_server에서 주입
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- 응답 도우미 ---
+
+    def _send(self, status, body, content_type="application/json"):
+        payload = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _graph_error(self, status, message, code=100, subcode=None):
+        error = {"message": message, "type": "OAuthException", "code": code, "fbtrace_id": "standin"}
+        if subcode is not None:
+            error["error_subcode"] = subcode
+        self._send(status, {"error": error})
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _before(self):
+        with self.state.lock:
+            self.state.request_count += 1
+        if self.state.config.latency_ms:
+            time.sleep(self.state.config.latency_ms / 1000)
+
+    def _inject_error(self):
+        """설정된 확률로 지정한 subcode 오류를 돌려줍니다. 오류를 보냈으면 True."""
+        config = self.state.config
+        if config.error_subcode and config.random.random() < config.error_rate:
+            self._graph_error(400, "Injected error", subcode=config.error_subcode)
+            return True
+        return False
+
+    # --- 라우팅 ---
+
+    def do_GET(self):
+        self._before()
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not url.path.startswith(API_PREFIX):
+            return self._send(404, "not found", "text/plain")
+        parts = [p for p in url.path[len(API_PREFIX):].split("/") if p]
+        if not parts and "ids" in query:
+            return self._send(200, {cid: self._status_of(cid) for cid in query["ids"].split(",")})
+        if len(parts) == 2 and parts[1] == "threads_publishing_limit":
+            used = self.state.publish_count.get(parts[0], 0)
+            return self._send(200, {"data": [{"quota_usage": used, "config": {"quota_total": self.state.config.quota_total, "quota_duration": 86400}}]})
+        if len(parts) == 1:
+            with self.state.lock:
+                exists = parts[0] in self.state.containers
+            if not exists:
+                return self._graph_error(400, "Unsupported get request", subcode=33)
+            return self._send(200, self._status_of(parts[0]))
+        return self._send(404, "not found", "text/plain")
+
+    def do_POST(self):
+        self._before()
+        url = urlparse(self.path)
+        body = self._read_body()
+        if url.path == CATBOX_PATH:
+            return self._catbox_upload(body)
+        form = {k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()}
+        parts = [p for p in url.path[len(API_PREFIX):].split("/") if p] if url.path.startswith(API_PREFIX) else []
+        if len(parts) == 2 and parts[1] == "threads":
+            return self._create_container(parts[0], form)
+        if len(parts) == 2 and parts[1] == "threads_publish":
+            return self._publish(parts[0], form)
+        return self._send(404, "not found", "text/plain")
+
+    # --- 동작 ---
+
+    def _status_of(self, container_id):
+        with self.state.lock:
+            container = self.state.containers.get(container_id)
+        return {"id": container_id, "status_code": container.status if container else "EXPIRED"}
+
+    def _create_container(self, user_id, form):
+        if self._inject_error():
+            return
+        config = self.state.config
+        media_type = form.get("media_type", "TEXT").upper()
+        delay_ms = {"IMAGE": config.image_ms, "VIDEO": config.video_ms, "CAROUSEL": config.carousel_ms}.get(media_type, 0)
+        auto_publish = media_type == "TEXT" and form.get("auto_publish_text", "").lower() == "true"
+        if auto_publish:
+            return self._auto_publish_text(user_id)
+        children = form.get("children", "").split(",") if media_type == "CAROUSEL" else []
+        with self.state.lock:
+            ready = all(self.state.containers.get(child_id) is not None
+                        and self.state.containers[child_id].status == "FINISHED" for child_id in children)
+            if ready:
+                container = _Container(self.state.new_id(), media_type, time.monotonic() + delay_ms / 1000, children)
+                self.state.containers[container.id] = container
+        if not ready:
+            return self._graph_error(400, "The media is not ready for publishing", subcode=4279009)
+        self._send(200, {"id": container.id})
+
+    def _auto_publish_text(self, user_id):
+        if not self.state.config.auto_publish_text:
+            return self._graph_error(400, "(#100) Invalid parameter: auto_publish_text")
+        with self.state.lock:
+            container = _Container(self.state.new_id(), "TEXT", time.monotonic())
+            container.published = True
+            self.state.containers[container.id] = container
+            self.state.publish_count[user_id] = self.state.publish_count.get(user_id, 0) + 1
+        self._send(200, {"id": container.id})
+
+    def _publish(self, user_id, form):
+        if self._inject_error():
+            return
+        with self.state.lock:
+            container = self.state.containers.get(form.get("creation_id", ""))
+            ready = container is not None and container.status == "FINISHED"
+            if ready:
+                container.published = True
+                self.state.publish_count[user_id] = self.state.publish_count.get(user_id, 0) + 1
+                media_id = self.state.new_id()
+        if not ready:
+            return self._graph_error(400, "The media is not ready for publishing", subcode=4279009)
+        self._send(200, {"id": media_id})
+
+    def _catbox_upload(self, body):
+        with self.state.lock:
+            self.state.upload_count += 1
+            self.state.upload_bytes += len(body)
+            number = self.state.upload_count
+        host = self.headers.get("Host", "localhost")
+        self._send(200, f"http://{host}/files/{number}.bin", "text/plain")
+
+
+def make_server(config=None, host="127.0.0.1", port=0):
+    """대역 서버를 만듭니다. port=0이면 빈 포트를 자동으로 사용합니다."""
+    state = StandinState(config or StandinConfig())
+    handler = type("BoundStandinHandler", (StandinHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def start_in_background(config=None, host="127.0.0.1", port=0):
+    """대역 서버를 백그라운드 스레드에서 시작하고 (server, root_url)을 반환합니다."""
+    server = make_server(config, host, port)
+    thread = threading.Thread(target=server.serve_forever, name="GraphStandin", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Threads Graph API + Catbox 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=int, default=30, help="요청마다 추가할 지연(ms)")
+    parser.add_argument("--image-ms", type=int, default=200, help="IMAGE 컨테이너 IN_PROGRESS 시간(ms)")
+    parser.add_argument("--video-ms", type=int, default=2000, help="VIDEO 컨테이너 IN_PROGRESS 시간(ms)")
+    parser.add_argument("--error-subcode", type=int, help="주입할 오류 subcode (예: 4279009)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 주입 확률 (0~1)")
+    parser.add_argument("--reject-auto-publish", action="store_true", help="auto_publish_text 요청을 code 100으로 거부")
+    args = parser.parse_args()
+
+    config = StandinConfig(args.latency, args.image_ms, args.video_ms,
+                           error_subcode=args.error_subcode, error_rate=args.error_rate,
+                           auto_publish_text=not args.reject_auto_publish)
+    server = make_server(config, args.host, args.port)
+    print(f"대역 서버 실행 중: http://{args.host}:{args.port}{API_PREFIX} , Catbox: http://{args.host}:{args.port}{CATBOX_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
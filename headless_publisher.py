@@ -0,0 +1,310 @@
+"""
+PyQt5/Playwright 없이 공식 Threads API 경로(catbox_uploader + threads_api_helper/threads_carousel_helper)만으로
+게시글 대기열을 게시하는 헤드리스 실행기.
+
+사용법:
+    python headless_publisher.py            # 대기 중인 게시글마다 다음 회차를 한 번 게시하고 종료
+    python headless_publisher.py --daemon   # 예약 시각/반복 간격에 맞춰 계속 게시 (서비스용)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import threads_api_helper
+import threads_carousel_helper
+from catbox_uploader import upload_file
+from config_store import get_settings_store
+from media_preprocess import MAX_IMAGE_WIDTH, MediaTarget, configure_preprocessor
+from post_queue_store import QUEUE_DB, POSTS_FILE, STATUS_DONE, STATUS_FAILED, STATUS_PENDING, STATUS_RUNNING, open_queue
+from publish_checkpoint import CheckpointStore, checkpoint_key
+from publish_quota import QuotaExceededError, get_quota_tracker
+from publish_scheduler import DEFAULT_REPEAT_SPACING, PublishScheduler, parse_due_time
+from threads_errors import raise_if_cancelled
+from token_manager import TokenManager
+
+ACCOUNTS_FILE = "accounts.json"
+
+# 대기열에 새로 추가된 게시글을 확인하는 간격(초, --daemon 모드)
+DEFAULT_RESCAN_INTERVAL = 30
+
+# 게시 한도 초과로 보류된 게시글을 데몬 모드에서 다시 시도하기까지의 대기 시간(초)
+QUOTA_RETRY_DELAY = 60 * 60
+
+
+def load_accounts(path=ACCOUNTS_FILE, usernames=None):
+    """accounts.json에서 API 게시가 가능한(api_id/token이 있는) 계정을 읽습니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        accounts = json.load(f)
+    selected = []
+    for account in accounts:
+        if usernames:
+            if account.get("username") not in usernames:
+                continue
+        elif not account.get("checked"):
+            continue
+        if account.get("api_id") and account.get("token"):
+            selected.append(account)
+    return selected
+
+
+def account_proxies(account):
+    """계정의 proxy_ip/proxy_port로 requests용 proxies 딕셔너리를 만듭니다."""
+    ip = (account.get("proxy_ip") or "").strip()
+    port = (account.get("proxy_port") or "").strip()
+    if not ip or not port:
+        return None
+    proxy = f"http://{ip}:{port}"
+    return {"http": proxy, "https": proxy}
+
+
+def post_media_items(post):
+    """게시글의 미디어를 post_carousel 형식의 media_items 리스트로 변환합니다."""
+    items = []
+    if post.get("media_files"):
+        items.extend(threads_carousel_helper.media_items_from_files(post["media_files"]))
+    if post.get("image_url"):
+        items.append({"type": "IMAGE", "url": post["image_url"]})
+    if post.get("video_url"):
+        items.append({"type": "VIDEO", "url": post["video_url"]})
+    return items
+
+
+def publish_post(post, account, checkpoint=None, cancel_event=None):
+    """게시글 1건을 계정 1개로 게시합니다. 실패 시 예외를, 취소되면 PublishCancelledError를 발생시킵니다."""
+    api_id = account["api_id"]
+    token = account["token"]
+    proxies = account_proxies(account)
+    text = post.get("content") or post.get("title") or ""
+    items = post_media_items(post)
+
+    if len(items) >= 2:
+        return threads_carousel_helper.post_carousel(api_id, token, items, text, proxies=proxies, checkpoint=checkpoint,
+                                                     cancel_event=cancel_event)
+
+    # 게시 직후 중단되었다가 재시도하는 경우 같은 글을 두 번 올리지 않도록 저장된 결과를 반환
+    if checkpoint and checkpoint.result:
+        print("[Publish] 이미 게시가 완료된 게시글입니다. 저장된 결과를 반환합니다.")
+        return checkpoint.result
+
+    if len(items) == 1:
+        item = items[0]
+        url = item.get("url") or (checkpoint.get_upload(0) if checkpoint else None)
+        if not url:
+            url = upload_file(item["path"])
+            if checkpoint:
+                checkpoint.set_upload(0, url)
+        raise_if_cancelled(cancel_event)
+        if item["type"] == "VIDEO":
+            _, result = threads_api_helper.post_video(api_id, token, url, text, proxies=proxies, checkpoint=checkpoint,
+                                                      cancel_event=cancel_event, raise_errors=True)
+        else:
+            _, result = threads_api_helper.post_single_image(api_id, token, url, text, proxies=proxies,
+                                                             cancel_event=cancel_event, raise_errors=True)
+    else:
+        # 원래 예외(GraphAPIError 등)를 그대로 올려 토큰 무효(code 190/102)가 report_error에 전달되게 함
+        _, result = threads_api_helper.post_text(api_id, token, text, proxies=proxies, raise_errors=True)
+    if checkpoint:
+        checkpoint.set_result(result)
+    return result
+
+
+def publish_checkpoint_key(post, account, repeat_index):
+    """게시글 1건의 repeat_index번째 게시를 계정 1개로 할 때 사용하는 체크포인트 키"""
+    return checkpoint_key(account["api_id"], post.get("content"), post_media_items(post),
+                          run_id=f"{post['id']}:{repeat_index}")
+
+
+def publish_for_account(post, account, repeat_index, checkpoints, tokens, quota, cancel_event=None,
+                        remove_checkpoint=True):
+    """
+    토큰 확인 → 게시 한도 입장 제어 → 체크포인트를 이용한 게시까지 계정 1개 분량의 게시를 수행합니다.
+    성공하면 게시 결과를 반환하고 (remove_checkpoint이면) 체크포인트를 지우며, 실패하면 예외를 발생시킵니다.
+    이미 게시가 끝난 체크포인트가 있으면 토큰/한도 확인 없이 저장된 결과를 반환합니다.
+    """
+    key = publish_checkpoint_key(post, account, repeat_index)
+    checkpoint = checkpoints.load(key)
+    if checkpoint.result:
+        if remove_checkpoint:
+            checkpoints.remove(key)
+        return checkpoint.result
+    try:
+        raise_if_cancelled(cancel_event)
+        tokens.ensure_valid(account, proxies=account_proxies(account))
+        with quota.admit(account["api_id"], account["token"], proxies=account_proxies(account)):
+            result = publish_post(post, account, checkpoint=checkpoint, cancel_event=cancel_event)
+    except Exception as e:
+        tokens.report_error(account, e)
+        raise
+    if remove_checkpoint:
+        checkpoints.remove(key)
+    return result
+
+
+class HeadlessPublisher:
+    """대기열의 게시글을 선택된 계정들로 게시하고, 상태/반복 진행을 대기열에 기록합니다."""
+
+    def __init__(self, store, accounts, concurrent_limit=1, auto_delete_completed=False, accounts_path=ACCOUNTS_FILE):
+        self.store = store
+        self.accounts = accounts
+        self.concurrent_limit = max(1, concurrent_limit)
+        self.auto_delete_completed = auto_delete_completed
+        self.checkpoints = CheckpointStore()
+        self.quota = get_quota_tracker()
+        self.tokens = TokenManager(accounts_path)
+        self._scheduler = None
+
+    def _accounts_for(self, post):
+        if post.get("account"):
+            return [a for a in self.accounts if a.get("username") == post["account"]]
+        return self.accounts
+
+    def _publish_with_account(self, post, account, repeat_index):
+        """성공하면 True, 실패하면 False, 게시 한도 초과로 보류되면 None을 반환합니다."""
+        username = account.get("username")
+        try:
+            # 체크포인트는 모든 계정이 끝난 뒤에 지움 (보류된 계정 때문에 다시 시도할 때 성공한 계정은 건너뜀)
+            result = publish_for_account(post, account, repeat_index, self.checkpoints, self.tokens, self.quota,
+                                         remove_checkpoint=False)
+            print(f"[Headless] ✅ 게시 완료: #{post['id']} → {username} ({result})")
+            return True
+        except QuotaExceededError as e:
+            print(f"[Headless] ⏸ 게시 보류: #{post['id']} → {username}: {e}")
+            return None
+        except Exception as e:
+            print(f"[Headless] ❌ 게시 실패: #{post['id']} → {username}: {e}")
+            return False
+
+    def publish(self, post_id, repeat_index=0):
+        """게시글 1건의 repeat_index번째 게시를 수행합니다. 모든 계정이 성공하면 True."""
+        post = self.store.get(post_id)
+        if post is None or post["status"] in (STATUS_DONE, STATUS_FAILED):
+            return False
+        if not self.store.reject_invalid(post):
+            return False
+        accounts = self._accounts_for(post)
+        if not accounts:
+            print(f"[Headless] 게시할 계정이 없습니다: #{post_id}")
+            return False
+
+        self.store.set_status(post_id, STATUS_RUNNING)
+        print(f"[Headless] 게시 시작: #{post_id} '{post.get('title', '')}' ({repeat_index + 1}/{post['repeat_count']}회차, 계정 {len(accounts)}개)")
+        with ThreadPoolExecutor(max_workers=min(self.concurrent_limit, len(accounts))) as executor:
+            results = list(executor.map(lambda a: self._publish_with_account(post, a, repeat_index), accounts))
+
+        if all(results):
+            for account in accounts:
+                self.checkpoints.remove(publish_checkpoint_key(post, account, repeat_index))
+            updated = self.store.advance_repeat(post_id)
+            if updated["status"] == STATUS_DONE and self.auto_delete_completed:
+                self.store.delete(post_id)
+            return True
+        if False not in results:
+            self._defer(post_id, repeat_index)
+            return False
+        self.store.set_status(post_id, STATUS_FAILED)
+        return False
+
+    def _defer(self, post_id, repeat_index):
+        """게시 한도 초과로 보류된 게시글을 대기 상태로 되돌리고, 데몬 모드면 QUOTA_RETRY_DELAY초 뒤로 다시 예약합니다."""
+        self.store.set_status(post_id, STATUS_PENDING)
+        scheduler = self._scheduler
+        if scheduler is not None:
+            scheduler.schedule(post_id, time.time() + QUOTA_RETRY_DELAY, repeat_index)
+            print(f"[Headless] 게시 한도 초과: #{post_id}를 {QUOTA_RETRY_DELAY // 60}분 뒤에 다시 시도합니다.")
+        else:
+            print(f"[Headless] 게시 한도 초과: #{post_id}를 대기 상태로 남겨 둡니다.")
+
+    def recover_interrupted(self):
+        """이전 실행이 중간에 종료되어 '진행중'으로 남은 게시글을 대기 상태로 되돌립니다. (체크포인트로 이어서 게시)"""
+        for post in self.store.by_status(STATUS_RUNNING):
+            self.store.set_status(post["id"], STATUS_PENDING)
+
+    def run_once(self):
+        """대기 중인 게시글마다 다음 회차를 한 번씩 즉시 게시합니다. (scheduled_at이 아직 오지 않은 게시글은 건너뜀)"""
+        self.recover_interrupted()
+        published = failed = waiting = 0
+        now = time.time()
+        for post in self.store.by_status(STATUS_PENDING):
+            try:
+                due_at = parse_due_time(post.get("scheduled_at"), default=now)
+            except ValueError:
+                due_at = now  # publish()의 검증에서 실패 사유와 함께 걸러짐
+            if due_at > now:
+                waiting += 1
+                continue
+            if self.publish(post["id"], post["repeat_progress"]):
+                published += 1
+            else:
+                failed += 1
+        print(f"[Headless] 완료: 성공 {published}건, 실패 {failed}건, 예약 대기 {waiting}건")
+        return failed == 0
+
+    def run_daemon(self, spacing=DEFAULT_REPEAT_SPACING, rescan_interval=DEFAULT_RESCAN_INTERVAL):
+        """
+        예약 시각에 맞춰 게시하며, 새로 추가된 게시글은 rescan_interval초마다 예약합니다.
+        다시 읽을 때는 마지막으로 본 id보다 큰 게시글만 조회합니다.
+        """
+        self.recover_interrupted()
+        scheduler = PublishScheduler(self.publish, max_workers=self.concurrent_limit)
+        self._scheduler = scheduler
+        last_id = 0
+        self.tokens.start(self.accounts, proxies_for=account_proxies)
+        scheduler.start()
+        print("[Headless] 데몬 모드 시작 (Ctrl+C로 종료)")
+        try:
+            while True:
+                for post in self.store.by_status(STATUS_PENDING, after_id=last_id):
+                    last_id = max(last_id, post["id"])
+                    scheduler.schedule_stored_post(self.store, post, spacing=spacing)
+                time.sleep(rescan_interval)
+        except KeyboardInterrupt:
+            print("[Headless] 종료 요청을 받았습니다.")
+        finally:
+            self._scheduler = None
+            scheduler.stop()
+            self.tokens.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PyQt 없이 Threads 공식 API로 게시글 대기열을 게시합니다.")
+    parser.add_argument("--daemon", action="store_true", help="예약 시각에 맞춰 계속 실행")
+    parser.add_argument("--accounts", default=ACCOUNTS_FILE, help="계정 파일 (기본: accounts.json)")
+    parser.add_argument("--account", action="append", help="게시할 계정 username (여러 번 지정 가능, 기본: checked 계정)")
+    parser.add_argument("--queue", default=QUEUE_DB, help="대기열 DB (기본: posts.db)")
+    parser.add_argument("--posts", default=POSTS_FILE, help="처음 실행 시 가져올 posts.json")
+    parser.add_argument("--spacing", type=float, default=DEFAULT_REPEAT_SPACING / 60, help="반복 게시 간격(분)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.accounts):
+        print(f"계정 파일이 없습니다: {args.accounts}")
+        return 1
+    accounts = load_accounts(args.accounts, args.account)
+    if not accounts:
+        print("api_id와 token이 설정된 계정이 없습니다.")
+        return 1
+
+    settings = get_settings_store().load()
+    if settings.get("media_preprocess"):
+        configure_preprocessor(target=MediaTarget(
+            max_image_width=int(settings.get("media_max_image_width", MAX_IMAGE_WIDTH)),
+            jpeg_quality=int(settings.get("media_jpeg_quality", 85)),
+            video=bool(settings.get("media_preprocess_video", False)),
+        ))
+    publisher = HeadlessPublisher(
+        open_queue(args.queue, args.posts),
+        accounts,
+        concurrent_limit=int(settings.get("concurrent_limit", 1) or 1),
+        auto_delete_completed=bool(settings.get("auto_delete_completed_posts", False)),
+        accounts_path=args.accounts,
+    )
+    if args.daemon:
+        publisher.run_daemon(spacing=args.spacing * 60)
+        return 0
+    return 0 if publisher.run_once() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+GUI 로그 창용 로그 싱크.
+워커 스레드가 보내는 진행 메시지를 모아 두었다가 일정 간격으로 한 번에 QTextEdit에 추가하고,
+창에는 최근 max_lines줄만 남깁니다. 전체 로그는 회전되는 로그 파일에 기록되며,
+파일 쓰기는 QueueListener 스레드가 맡으므로 UI 스레드는 디스크 I/O를 하지 않습니다.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from PyQt5 import QtCore
+
+LOG_FILE = os.path.join("logs", "automation.log")
+
+# 로그 창에 남길 최대 줄 수
+DEFAULT_MAX_LINES = 2000
+
+# 로그 창 갱신 간격(ms)
+DEFAULT_FLUSH_INTERVAL = 200
+
+# 로그 파일 회전 기준 (bytes) 과 보관할 이전 파일 수
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+
+_listeners = []
+
+
+def _file_logger(path, max_bytes, backup_count):
+    """
+    경로별로 하나의 회전 파일 로거를 만듭니다. (같은 파일에 핸들러가 중복으로 붙지 않도록)
+    로거에는 QueueHandler만 붙이고, 실제 파일 쓰기는 백그라운드 QueueListener가 처리합니다.
+    """
+    logger = logging.getLogger(f"log_sink.{os.path.abspath(path)}")
+    if not logger.handlers:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, handler)
+        listener.start()
+        _listeners.append(listener)
+        logger.addHandler(QueueHandler(records))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+@atexit.register
+def _stop_listeners():
+    """종료 시 큐에 남은 로그를 파일에 모두 기록합니다."""
+    for listener in _listeners:
+        listener.stop()
+    _listeners.clear()
+
+
+class LogSink(QtCore.QObject):
+    """
+    QTextEdit 로그 창 앞에 두는 링 버퍼.
+    append()는 어느 스레드에서 불러도 되며, 창 갱신은 QTimer로 flush_interval마다 묶어서 처리합니다.
+    """
+
+    def __init__(self, widget, path=LOG_FILE, max_lines=DEFAULT_MAX_LINES, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_bytes=MAX_LOG_BYTES, backup_count=LOG_BACKUP_COUNT, parent=None):
+        super().__init__(parent or widget)
+        self.widget = widget
+        self.max_lines = max_lines
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_lines)
+        self._pending = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._logger = _file_logger(path, max_bytes, backup_count) if path else None
+
+        widget.document().setMaximumBlockCount(max_lines)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def append(self, message):
+        """메시지를 버퍼와 로그 파일 큐에 넣습니다. 창에는 다음 갱신 때 표시됩니다."""
+        message = str(message)
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(message)
+            self._lines.append(message)
+        if self._logger:
+            self._logger.info(message)
+
+    def flush(self):
+        """쌓인 메시지를 한 번에 창에 추가합니다. (UI 스레드에서 호출)"""
+        with self._lock:
+            if not self._pending:
+                return
+            batch = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            batch.insert(0, f"... 로그 {dropped}줄 생략 (전체 로그는 파일 참고)")
+        scrollbar = self.widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.widget.append("\n".join(batch))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def lines(self):
+        """버퍼에 남아 있는 최근 로그 줄 목록을 반환합니다."""
+        with self._lock:
+            return list(self._lines)
+
+    def text(self):
+        return "\n".join(self.lines())
+
+    def clear(self):
+        """창과 버퍼를 비웁니다. 로그 파일은 그대로 둡니다."""
+        with self._lock:
+            self._lines.clear()
+            self._pending.clear()
+            self._dropped = 0
+        self.widget.clear()
+
+    def stop(self):
+        """타이머를 멈추고 남은 메시지를 창에 반영합니다."""
+        self._timer.stop()
+        self.flush()
@@ -8,11 +8,50 @@ from PyQt5.QtWidgets import (
     QMessageBox, QTextEdit, QApplication, QFrame
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 from datetime import datetime, timedelta
 
 from multi_account_gui import MultiAccountGUI
 
+IP_LOOKUP_URL = "https://api.ipify.org?format=json"
+EXPIRY_LOOKUP_URL = "https://port-0-fnlunasea-m66s84vua61720dd.sel4.cloudtype.app/api/expiry_by_ip"
+
+# 시작 시 네트워크 확인 요청의 타임아웃 (연결, 응답) 초
+STARTUP_TIMEOUT = (3, 5)
+
+def lookup_ip():
+    """공인 IP를 조회합니다."""
+    response = requests.get(IP_LOOKUP_URL, timeout=STARTUP_TIMEOUT)
+    return response.json().get("ip", "알 수 없음")
+
+def lookup_expiry(ip):
+    """IP 기반 사용 만료일을 조회합니다. 실패하면 None."""
+    response = requests.get(EXPIRY_LOOKUP_URL, headers={"X-Forwarded-For": ip}, timeout=STARTUP_TIMEOUT)
+    expiry_data = response.json()
+    if expiry_data.get("success"):
+        return expiry_data.get("expiry_date")
+    return None
+
+class _TaskSignals(QObject):
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+class BackgroundTask(QRunnable):
+    """함수를 QThreadPool에서 실행하고 결과를 시그널로 UI 스레드에 전달합니다."""
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.succeeded.emit(result)
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -125,36 +164,52 @@ class LoginWindow(QDialog):
 
         self.setLayout(layout)
         self.login_success = False
-        self.fetch_ip()
+        self._tasks = []
+        # 창이 먼저 그려지도록 네트워크 확인은 이벤트 루프가 시작된 뒤 백그라운드에서 실행
+        QTimer.singleShot(0, self.fetch_ip)
 
     def log(self, message):
         self.log_area.append(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}")
 
+    def run_in_background(self, fn, on_success, on_failure, *args):
+        """fn(*args)를 UI 스레드 밖에서 실행하고, 끝나면 on_success/on_failure를 UI 스레드에서 호출합니다."""
+        task = BackgroundTask(fn, *args)
+        self._tasks.append(task.signals)
+
+        def done():
+            if task.signals in self._tasks:
+                self._tasks.remove(task.signals)
+
+        task.signals.succeeded.connect(on_success)
+        task.signals.failed.connect(on_failure)
+        task.signals.succeeded.connect(done)
+        task.signals.failed.connect(done)
+        QThreadPool.globalInstance().start(task)
+
     def fetch_ip(self):
-        try:
-            response = requests.get("https://api.ipify.org?format=json")
-            ip = response.json().get("ip", "알 수 없음")
-            self.ip_label.setText(f"📡 내 접속 IP: {ip}")
-            self.log(f"📡 내 접속 IP: {ip}")
-
-            # IP 기반 만료일 요청
-            expiry_res = requests.get(
-                "https://port-0-fnlunasea-m66s84vua61720dd.sel4.cloudtype.app/api/expiry_by_ip",
-                headers={"X-Forwarded-For": ip}
-            )
-            expiry_data = expiry_res.json()
-            if expiry_data.get("success"):
-                expiry_date = expiry_data.get("expiry_date")
-                self.update_expiry_info(expiry_date)
-                self.log(f"✅ IP기반 사용기간 조회 성공: {expiry_date}")
-                return  # 성공 시 except로 안 넘어가게!
-            else:
-                self.expiry_label.setText("남은 사용 기간: 확인 불가")
-                self.log("남은 사용 기간: 확인 불가")
+        """IP 조회 → IP 기반 만료일 조회를 백그라운드에서 진행합니다. (만료일 조회는 IP 값이 필요하므로 순서대로 실행)"""
+        self.run_in_background(lookup_ip, self.on_ip_fetched, self.on_ip_failed)
 
-        except Exception as e:
-            self.expiry_label.setText("남은 사용 기간: 확인 불가")
-            self.log("남은 사용 기간: 확인 불가")
+    def on_ip_fetched(self, ip):
+        self.ip_label.setText(f"📡 내 접속 IP: {ip}")
+        self.log(f"📡 내 접속 IP: {ip}")
+        self.run_in_background(lookup_expiry, self.on_expiry_fetched, self.on_expiry_failed, ip)
+
+    def on_ip_failed(self, error):
+        self.ip_label.setText("📡 내 접속 IP: 확인 불가")
+        self.log(f"📡 IP 조회 실패: {error}")
+        self.on_expiry_failed(error)
+
+    def on_expiry_fetched(self, expiry_date):
+        if expiry_date:
+            self.update_expiry_info(expiry_date)
+            self.log(f"✅ IP기반 사용기간 조회 성공: {expiry_date}")
+        else:
+            self.on_expiry_failed("")
+
+    def on_expiry_failed(self, error):
+        self.expiry_label.setText("남은 사용 기간: 확인 불가")
+        self.log("남은 사용 기간: 확인 불가")
 
     def try_login(self):
         username = self.id_input.text().strip()
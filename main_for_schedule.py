@@ -5,12 +5,12 @@ import time
 import hashlib
 import re
 import random
-import json
-import os
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import QMessageBox, QTabWidget, QWidget, QFileDialog
 from PyQt5.QtCore import QObject, pyqtSignal
 from playwright.sync_api import Playwright, sync_playwright, Page, BrowserContext
+from config_store import get_store
+from log_sink import LogSink
 import random
 
 # 상수 정의
@@ -21,22 +21,12 @@ CONFIG_FILE = "threads_config.json"
 SESSION_STORE = {}
 
 def load_config():
-    """설정 파일 로드"""
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    """설정 파일 로드 (메모리에 캐시된 설정의 복사본)"""
+    return get_store(CONFIG_FILE).load()
 
 def save_config(config):
-    """설정 파일 저장"""
-    try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"설정 저장 실패: {e}")
+    """설정 저장 (연속 변경은 합쳐서 백그라운드에서 원자적으로 기록)"""
+    get_store(CONFIG_FILE).replace(config)
 
 def sanitize_folder_name(name):
     """폴더명에서 사용할 수 없는 문자 제거"""
@@ -575,6 +565,8 @@ class MainWindow(QWidget):
                 font-size: 11px;
             }
         """)
+        # 진행 메시지는 200ms마다 묶어서 표시하고, 창에는 최근 2000줄만 유지 (전체 로그: logs/automation.log)
+        self.log_sink = LogSink(self.log_box)
         
         # 로그 제어 버튼
         log_control_layout = QtWidgets.QHBoxLayout()
@@ -619,8 +611,8 @@ class MainWindow(QWidget):
         self.load_saved_config()
         
         # 초기 메시지
-        self.log_box.append("🔧 먼저 '연결 및 로그인 테스트'를 완료해주세요!")
-        self.log_box.append("💾 설정 저장/불러오기 기능을 사용할 수 있습니다.")
+        self.log_sink.append("🔧 먼저 '연결 및 로그인 테스트'를 완료해주세요!")
+        self.log_sink.append("💾 설정 저장/불러오기 기능을 사용할 수 있습니다.")
     
     def test_connection_and_login(self):
         """연결 및 로그인 테스트"""
@@ -631,7 +623,7 @@ class MainWindow(QWidget):
         password = self.password_edit.text().strip()
         
         if not email or not password:
-            self.log_box.append('⚠️ 로그인 정보를 입력해주세요!')
+            self.log_sink.append('⚠️ 로그인 정보를 입력해주세요!')
             return
         
         self.proxy_test_button.setEnabled(False)
@@ -644,7 +636,7 @@ class MainWindow(QWidget):
         # 시그널 연결
         self.test_thread.started.connect(self.test_worker.run)
         self.test_worker.finished.connect(self.on_test_finished)
-        self.test_worker.progress.connect(self.log_box.append)
+        self.test_worker.progress.connect(self.log_sink.append)
         self.test_worker.test_success.connect(self.on_test_success) # 성공 시그널 연결
         self.test_worker.test_error.connect(self.on_test_error) # 오류 시그널 연결
         self.test_worker.finished.connect(self.test_thread.quit)
@@ -676,7 +668,7 @@ class MainWindow(QWidget):
         self.interval_combo.setEnabled(True)
         self.run_button.setEnabled(True)
         
-        self.log_box.append('✅ 이제 자동화를 시작할 수 있습니다!')
+        self.log_sink.append('✅ 이제 자동화를 시작할 수 있습니다!')
 
     def on_test_success(self, test_type, proxy_server, ip_info, email, login_status):
         """테스트 성공 시 처리"""
@@ -700,13 +692,13 @@ class MainWindow(QWidget):
         self.interval_combo.setEnabled(True)
         self.run_button.setEnabled(True)
         
-        self.log_box.append(f'✅ 이제 자동화를 시작할 수 있습니다!')
-        self.log_box.append(f'🌐 연결 방식: {test_type} 연결')
-        self.log_box.append(f'📡 프록시 정보: {proxy_server}')
-        self.log_box.append(f'📍 현재 IP: {ip_info}')
-        self.log_box.append(f'🔐 로그인 계정: {email}')
-        self.log_box.append(f'✅ 상태: {login_status}')
-        self.log_box.append('💾 세션 저장 완료')
+        self.log_sink.append(f'✅ 이제 자동화를 시작할 수 있습니다!')
+        self.log_sink.append(f'🌐 연결 방식: {test_type} 연결')
+        self.log_sink.append(f'📡 프록시 정보: {proxy_server}')
+        self.log_sink.append(f'📍 현재 IP: {ip_info}')
+        self.log_sink.append(f'🔐 로그인 계정: {email}')
+        self.log_sink.append(f'✅ 상태: {login_status}')
+        self.log_sink.append('💾 세션 저장 완료')
 
     def on_test_error(self, error_msg):
         """테스트 실패 시 처리"""
@@ -730,7 +722,7 @@ class MainWindow(QWidget):
         self.interval_combo.setEnabled(True)
         self.run_button.setEnabled(True)
         
-        self.log_box.append(f'❌ 테스트 실패: {error_msg}')
+        self.log_sink.append(f'❌ 테스트 실패: {error_msg}')
 
     def create_test_user_context(self, playwright, email, password, proxy_server, proxy_username, proxy_password):
         """테스트용 브라우저 컨텍스트 생성"""
@@ -772,25 +764,25 @@ class MainWindow(QWidget):
         proxy_password = self.proxy_password_edit.text().strip()
         
         if not manual_comments:
-            self.log_box.append("⚠️ 랜덤 댓글이 없습니다. 댓글 단계는 건너뛰고 실행합니다.")
+            self.log_sink.append("⚠️ 랜덤 댓글이 없습니다. 댓글 단계는 건너뛰고 실행합니다.")
         
         if not email or not password:
-            self.log_box.append("⚠️ 이메일과 비밀번호를 입력해주세요!")
+            self.log_sink.append("⚠️ 이메일과 비밀번호를 입력해주세요!")
             return
         
         # 작업 개수 로그 출력
-        self.log_box.append(f"📊 작업 개수 설정:")
-        self.log_box.append(f"   팔로우: {follow_count}명")
-        self.log_box.append(f"   좋아요: {like_range}개 (각 팔로워당)")
-        self.log_box.append(f"   리포스트: {repost_range}개 (각 팔로워당)")
-        self.log_box.append(f"   댓글: {comment_range}개 (각 팔로워당)")
+        self.log_sink.append(f"📊 작업 개수 설정:")
+        self.log_sink.append(f"   팔로우: {follow_count}명")
+        self.log_sink.append(f"   좋아요: {like_range}개 (각 팔로워당)")
+        self.log_sink.append(f"   리포스트: {repost_range}개 (각 팔로워당)")
+        self.log_sink.append(f"   댓글: {comment_range}개 (각 팔로워당)")
         
         if proxy_server:
-            self.log_box.append(f"🌐 프록시 사용: {proxy_server}")
+            self.log_sink.append(f"🌐 프록시 사용: {proxy_server}")
             if proxy_username:
-                self.log_box.append("🔐 프록시 인증 정보 포함")
+                self.log_sink.append("🔐 프록시 인증 정보 포함")
         else:
-            self.log_box.append("🌐 직접 연결 (프록시 미사용)")
+            self.log_sink.append("🌐 직접 연결 (프록시 미사용)")
         
         self.run_button.setEnabled(False)
         
@@ -815,16 +807,16 @@ class MainWindow(QWidget):
         interval_ms = interval_hours * 60 * 60 * 1000
         self.timer.start(interval_ms)
         
-        self.log_box.append(f"다음 실행 예정: {interval_hours}시간 후")
+        self.log_sink.append(f"다음 실행 예정: {interval_hours}시간 후")
     
     def on_progress(self, message):
         """진행 상황 업데이트"""
-        self.log_box.append(message)
+        self.log_sink.append(message)
     
     def on_finished(self):
         """작업 완료 처리"""
         self.run_button.setEnabled(True)
-        self.log_box.append("작업 완료!")
+        self.log_sink.append("작업 완료!")
 
     def load_saved_config(self):
         """프로그램 시작 시 저장된 설정 자동 로드"""
@@ -843,7 +835,7 @@ class MainWindow(QWidget):
             self.repost_range_edit.setText(config.get("repost_range", "0~2"))
             self.comment_range_edit.setText(config.get("comment_range", "1~3"))
             self.interval_combo.setCurrentText(str(config.get("interval_hours", "1")))
-            self.log_box.append("💾 저장된 설정이 자동으로 로드되었습니다.")
+            self.log_sink.append("💾 저장된 설정이 자동으로 로드되었습니다.")
 
     def save_current_config(self):
         """현재 설정을 파일에 저장"""
@@ -863,7 +855,7 @@ class MainWindow(QWidget):
             "interval_hours": int(self.interval_combo.currentText())
         }
         save_config(config)
-        self.log_box.append("설정이 저장되었습니다.")
+        self.log_sink.append("설정이 저장되었습니다.")
 
     def load_current_config(self):
         """저장된 설정을 불러와 UI에 표시"""
@@ -882,14 +874,14 @@ class MainWindow(QWidget):
             self.repost_range_edit.setText(config.get("repost_range", "0~2"))
             self.comment_range_edit.setText(config.get("comment_range", "1~3"))
             self.interval_combo.setCurrentText(str(config.get("interval_hours", "1")))
-            self.log_box.append("설정이 불러와졌습니다.")
+            self.log_sink.append("설정이 불러와졌습니다.")
         else:
-            self.log_box.append("저장된 설정이 없습니다.")
+            self.log_sink.append("저장된 설정이 없습니다.")
 
     def clear_log(self):
         """로그 박스의 내용을 지우기"""
-        self.log_box.clear()
-        self.log_box.append("로그가 지워졌습니다.")
+        self.log_sink.clear()
+        self.log_sink.append("로그가 지워졌습니다.")
 
     def save_log(self):
         """로그 박스의 내용을 파일에 저장"""
@@ -897,10 +889,10 @@ class MainWindow(QWidget):
         if file_name:
             try:
                 with open(file_name, 'w', encoding='utf-8') as f:
-                    f.write(self.log_box.toPlainText())
-                self.log_box.append(f"로그가 '{file_name}'에 저장되었습니다.")
+                    f.write(self.log_sink.text())
+                self.log_sink.append(f"로그가 '{file_name}'에 저장되었습니다.")
             except Exception as e:
-                self.log_box.append(f"로그 저장 실패: {e}")
+                self.log_sink.append(f"로그 저장 실패: {e}")
 
     def auto_save_config(self):
         """테스트 성공 시 설정을 자동으로 저장"""
@@ -920,11 +912,11 @@ class MainWindow(QWidget):
             "interval_hours": int(self.interval_combo.currentText())
         }
         save_config(config)
-        self.log_box.append("테스트 성공 시 설정이 자동으로 저장되었습니다.")
+        self.log_sink.append("테스트 성공 시 설정이 자동으로 저장되었습니다.")
 
     def auto_save_on_change(self):
         """입력 필드 값이 변경될 때마다 설정을 저장"""
-        # 로그 메시지 없이 조용히 저장
+        # 로그 메시지 없이 조용히 저장 (디스크 기록은 입력이 멈춘 뒤 백그라운드에서 한 번만 수행)
         config = {
             "email": self.email_edit.text(),
             "password": self.password_edit.text(),
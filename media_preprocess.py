@@ -0,0 +1,238 @@
+"""
+업로드 전 미디어 전처리.
+Threads 미디어 제한(형식, 크기, 가로 해상도)을 확인하고, 큰 이미지는 축소/재압축하며
+(선택) 동영상은 ffmpeg로 다시 인코딩합니다. 결과는 원본 내용 해시 + 설정별로 processed_media/에 캐시합니다.
+CPU 작업은 프로세스 풀에서 실행되므로 업로드 스레드를 막지 않습니다.
+
+Pillow가 없으면 이미지는 제한 확인만 하고 원본을 그대로 사용하며, ffmpeg가 없으면 동영상도 원본을 사용합니다.
+"""
+import atexit
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from upload_cache import file_sha256
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 배포본(main.spec)에서는 PIL을 제외하므로 없을 수 있음
+    Image = None
+
+PROCESSED_DIR = "processed_media"
+
+# Threads 미디어 제한
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+CONVERTIBLE_IMAGE_EXTENSIONS = (".webp", ".bmp", ".gif", ".tif", ".tiff")
+VIDEO_EXTENSIONS = (".mp4", ".mov")
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+MAX_IMAGE_WIDTH = 1440
+MIN_IMAGE_WIDTH = 320
+MAX_ASPECT_RATIO = 10
+MAX_VIDEO_BYTES = 1024 * 1024 * 1024
+
+DEFAULT_MAX_WORKERS = 2
+
+
+class MediaLimitError(ValueError):
+    """전처리로도 Threads 미디어 제한을 맞출 수 없는 파일"""
+
+
+class MediaTarget:
+    """전처리 목표 설정. 이 값들이 바뀌면 캐시된 결과도 새로 만듭니다."""
+
+    def __init__(self, max_image_width=MAX_IMAGE_WIDTH, jpeg_quality=85, max_image_bytes=2 * 1024 * 1024,
+                 video=False, max_video_width=1280, video_crf=28, min_video_bytes=20 * 1024 * 1024):
+        self.max_image_width = min(max_image_width, MAX_IMAGE_WIDTH)
+        self.jpeg_quality = jpeg_quality
+        self.max_image_bytes = min(max_image_bytes, MAX_IMAGE_BYTES)
+        self.video = video
+        self.max_video_width = max_video_width
+        self.video_crf = video_crf
+        self.min_video_bytes = min_video_bytes
+
+    def image_key(self):
+        return f"w{self.max_image_width}q{self.jpeg_quality}b{self.max_image_bytes}"
+
+    def video_key(self):
+        return f"w{self.max_video_width}crf{self.video_crf}"
+
+
+def _processed_path(out_dir, sha256, key, suffix):
+    return os.path.join(out_dir, f"{sha256[:32]}_{key}{suffix}")
+
+
+def _replace_if_smaller(tmp_path, out_path, original_size):
+    """결과가 원본보다 작을 때만 캐시에 넣습니다. 아니면 None."""
+    if os.path.getsize(tmp_path) >= original_size:
+        os.remove(tmp_path)
+        return None
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def preprocess_image(file_path, target, out_dir=PROCESSED_DIR):
+    """이미지를 제한에 맞게 축소/재압축한 파일 경로를 반환합니다. 손볼 필요가 없으면 원본 경로."""
+    ext = os.path.splitext(file_path)[1].lower()
+    size = os.path.getsize(file_path)
+    if Image is None:
+        if ext not in IMAGE_EXTENSIONS:
+            raise MediaLimitError(f"지원하지 않는 이미지 형식입니다 (JPEG/PNG만 가능): {file_path}")
+        if size > MAX_IMAGE_BYTES:
+            raise MediaLimitError(f"이미지가 8MB를 넘습니다 (Pillow가 없어 압축 불가): {file_path}")
+        return file_path
+
+    sha256 = file_sha256(file_path)
+    out_path = _processed_path(out_dir, sha256, target.image_key(), ".jpg")
+    if os.path.exists(out_path):
+        return out_path
+    # 다시 인코딩해도 작아지지 않았던 파일은 표시 파일만 남겨 두고 원본을 그대로 사용
+    keep_marker = _processed_path(out_dir, sha256, target.image_key(), ".original")
+    if os.path.exists(keep_marker):
+        return file_path
+
+    with Image.open(file_path) as image:
+        # EXIF 회전을 먼저 적용해야 세로 사진의 실제 가로/세로로 판단/축소합니다.
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+        if max(width, height) > MAX_ASPECT_RATIO * min(width, height):
+            raise MediaLimitError(f"이미지 가로세로 비율이 10:1을 넘습니다 ({width}x{height}): {file_path}")
+        if (ext in IMAGE_EXTENSIONS and width <= target.max_image_width
+                and size <= target.max_image_bytes):
+            return file_path
+
+        if width > target.max_image_width:
+            new_height = max(1, round(height * target.max_image_width / width))
+            image = image.resize((target.max_image_width, new_height), Image.LANCZOS)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+
+        os.makedirs(out_dir, exist_ok=True)
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        image.save(tmp_path, "JPEG", quality=target.jpeg_quality, optimize=True, progressive=True)
+
+    if image.width < MIN_IMAGE_WIDTH:
+        print(f"[Preprocess] 가로 {image.width}px 이미지는 Threads에서 확대되어 표시될 수 있습니다: {file_path}")
+    if ext not in IMAGE_EXTENSIONS:
+        os.replace(tmp_path, out_path)  # 형식 변환은 크기와 관계없이 필요
+        return out_path
+    if _replace_if_smaller(tmp_path, out_path, size):
+        return out_path
+    if size > MAX_IMAGE_BYTES:
+        raise MediaLimitError(f"이미지를 다시 압축해도 8MB 이하로 줄일 수 없습니다: {file_path}")
+    open(keep_marker, "w").close()
+    return file_path
+
+
+def _encode_video(ffmpeg, file_path, target, out_dir, size):
+    sha256 = file_sha256(file_path)
+    out_path = _processed_path(out_dir, sha256, target.video_key(), ".mp4")
+    if os.path.exists(out_path):
+        return out_path
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp.mp4"
+    command = [
+        ffmpeg, "-y", "-loglevel", "error", "-i", file_path,
+        "-vf", f"scale='min({target.max_video_width},iw)':-2",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", str(target.video_crf), "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart", tmp_path,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"[Preprocess] ffmpeg 인코딩 실패, 원본을 사용합니다: {file_path} ({result.stderr.strip()[-200:]})")
+        return None
+    return _replace_if_smaller(tmp_path, out_path, size)
+
+
+def preprocess_video(file_path, target, out_dir=PROCESSED_DIR):
+    """(target.video=True이고 ffmpeg가 있으면) 동영상을 다시 인코딩한 경로를 반환합니다. 아니면 원본 경로."""
+    size = os.path.getsize(file_path)
+    ffmpeg = shutil.which("ffmpeg") if target.video else None
+    processed = None
+    if ffmpeg and size >= target.min_video_bytes:
+        processed = _encode_video(ffmpeg, file_path, target, out_dir, size)
+    if processed is None and size > MAX_VIDEO_BYTES:
+        raise MediaLimitError(f"동영상이 1GB를 넘습니다: {file_path}")
+    return processed or file_path
+
+
+def preprocess_file(file_path, target, out_dir=PROCESSED_DIR):
+    """확장자에 따라 이미지/동영상 전처리를 수행합니다. (프로세스 풀에서 실행되는 함수)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in VIDEO_EXTENSIONS:
+        return preprocess_video(file_path, target, out_dir)
+    if ext in IMAGE_EXTENSIONS or ext in CONVERTIBLE_IMAGE_EXTENSIONS:
+        return preprocess_image(file_path, target, out_dir)
+    raise MediaLimitError(f"지원하지 않는 미디어 형식입니다: {file_path}")
+
+
+class MediaPreprocessor:
+    """전처리 작업을 프로세스 풀에 넘기는 래퍼. submit()은 결과 경로의 Future를 반환합니다."""
+
+    def __init__(self, target=None, out_dir=PROCESSED_DIR, max_workers=DEFAULT_MAX_WORKERS):
+        self.target = target or MediaTarget()
+        self.out_dir = out_dir
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def submit(self, file_path):
+        return self._pool().submit(preprocess_file, os.path.abspath(file_path), self.target, self.out_dir)
+
+    def process(self, file_path):
+        """전처리 결과 경로를 반환합니다. 풀 자체가 실패하면 원본 경로를 사용합니다."""
+        try:
+            return self.submit(file_path).result()
+        except MediaLimitError:
+            raise
+        except Exception as e:
+            print(f"[Preprocess] 전처리 실패, 원본을 업로드합니다: {file_path} ({e})")
+            return file_path
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_preprocessor = None
+_preprocessor_lock = threading.Lock()
+
+
+def get_preprocessor():
+    """configure_preprocessor()로 켠 공용 MediaPreprocessor를 반환합니다. 꺼져 있으면 None."""
+    with _preprocessor_lock:
+        return _preprocessor
+
+
+def configure_preprocessor(enabled=True, **options):
+    """업로드 전 전처리를 켜거나(target, out_dir, max_workers) 끕니다."""
+    global _preprocessor
+    with _preprocessor_lock:
+        if _preprocessor is not None:
+            _preprocessor.close()
+        _preprocessor = MediaPreprocessor(**options) if enabled else None
+        return _preprocessor
+
+
+@atexit.register
+def _shutdown():
+    with _preprocessor_lock:
+        if _preprocessor is not None:
+            _preprocessor.close()
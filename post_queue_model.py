@@ -0,0 +1,135 @@
+"""
+게시글 대기열(PostQueueStore)을 QTableView에 보여주는 가상화 모델.
+전체 게시글을 메모리에 올리지 않고, 화면에 필요한 구간만 page_size 단위로 읽어 최근 max_pages개 페이지만 보관합니다.
+상태 변경은 해당 행 하나만 dataChanged로 다시 그립니다.
+
+사용 예:
+    model = PostQueueModel(open_queue())
+    table_view.setModel(model)
+    runner.job_finished.connect(lambda job_id, status, message: model.notify_post_changed(runner.job(job_id).post["id"]))
+"""
+from collections import OrderedDict
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import Qt, pyqtSignal
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = 4
+
+# (헤더, 표시 값을 만드는 함수)
+COLUMNS = (
+    ("ID", lambda post: post["id"]),
+    ("제목", lambda post: post.get("title", "")),
+    ("상태", lambda post: post.get("status", "")),
+    ("반복", lambda post: f"{post.get('repeat_progress', 0)}/{post.get('repeat_count', 1)}"),
+    ("예약 시각", lambda post: post.get("scheduled_at") or ""),
+    ("계정", lambda post: post.get("account") or "전체"),
+)
+
+
+class PostQueueModel(QtCore.QAbstractTableModel):
+    """
+    PostQueueStore 위의 읽기 전용 테이블 모델.
+    행 수는 store.count()로 정하고, 각 행은 data()가 처음 요청될 때 해당 페이지를 store.page()로 읽어 옵니다.
+    """
+
+    _post_changed = pyqtSignal(int)
+
+    def __init__(self, store, page_size=DEFAULT_PAGE_SIZE, max_pages=DEFAULT_MAX_PAGES, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._row_count = store.count()
+        self._post_changed.connect(self._on_post_changed, Qt.QueuedConnection)
+
+    # --- 페이지 캐시 ---
+
+    def _page(self, page_index):
+        page = self._pages.get(page_index)
+        if page is None:
+            page = self.store.page(page_index * self.page_size, self.page_size)
+            self._pages[page_index] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_index)
+        return page
+
+    def post_at(self, row):
+        """row번째 게시글. (화면 밖이면 해당 페이지를 읽어 옵니다)"""
+        if not 0 <= row < self._row_count:
+            return None
+        page = self._page(row // self.page_size)
+        offset = row % self.page_size
+        return page[offset] if offset < len(page) else None
+
+    def _cached_row_of(self, post_id):
+        for page_index, page in self._pages.items():
+            for offset, post in enumerate(page):
+                if post["id"] == post_id:
+                    return page_index, offset
+        return None
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        post = self.post_at(index.row())
+        if post is None:
+            return None
+        if role == Qt.DisplayRole:
+            return str(COLUMNS[index.column()][1](post))
+        if role == Qt.UserRole:
+            return post["id"]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+    # --- 변경 반영 ---
+
+    def notify_post_changed(self, post_id):
+        """게시글 1건의 상태/반복 진행이 바뀌었음을 알립니다. 어느 스레드에서 불러도 됩니다."""
+        self._post_changed.emit(post_id)
+
+    def _on_post_changed(self, post_id):
+        cached = self._cached_row_of(post_id)
+        if cached is None:
+            return  # 화면 밖의 행은 다음에 읽을 때 새 값이 반영됨
+        page_index, offset = cached
+        post = self.store.get(post_id)
+        if post is None:
+            self.reload()  # 삭제된 경우 행 번호가 바뀌므로 전체를 다시 읽음
+            return
+        self._pages[page_index][offset] = post
+        row = page_index * self.page_size + offset
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def posts_appended(self):
+        """대기열 끝에 게시글이 추가된 뒤 호출합니다. 새 행만 삽입합니다."""
+        count = self.store.count()
+        if count <= self._row_count:
+            return
+        last_page = (self._row_count - 1) // self.page_size if self._row_count else None
+        self.beginInsertRows(QtCore.QModelIndex(), self._row_count, count - 1)
+        self._pages.pop(last_page, None)  # 마지막 페이지는 채워지지 않았을 수 있음
+        self._row_count = count
+        self.endInsertRows()
+
+    def reload(self):
+        """게시글 삭제/순서 변경 후 호출합니다. 캐시를 비우고 행 수를 다시 읽습니다."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._row_count = self.store.count()
+        self.endResetModel()
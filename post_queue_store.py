@@ -0,0 +1,263 @@
+import json
+import os
+import sqlite3
+import threading
+
+from config_store import write_json_atomic
+from post_validation import check_post, validate_post
+
+QUEUE_DB = "posts.db"
+POSTS_FILE = "posts.json"
+
+# 게시글 상태 값 (posts.json과 동일한 한글 표기)
+STATUS_PENDING = "대기중"
+STATUS_RUNNING = "진행중"
+STATUS_DONE = "완료"
+STATUS_FAILED = "실패"
+
+# 별도 컬럼으로 관리하는 필드. 나머지 필드(title, content, image_url, ...)는 data 컬럼에 JSON으로 저장합니다.
+_COLUMNS = ("status", "repeat_count", "repeat_progress")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    repeat_count INTEGER NOT NULL DEFAULT 1,
+    repeat_progress INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_status ON posts (status, position);
+CREATE INDEX IF NOT EXISTS idx_posts_position ON posts (position);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class PostQueueStore:
+    """
+    SQLite 기반 게시글 대기열.
+    게시글 1건의 상태/반복 진행 변경은 해당 행만 트랜잭션으로 갱신하므로, 대기열 크기와 무관하게 빠르고
+    저장 도중 프로그램이 종료되어도 파일이 깨지지 않습니다.
+    """
+
+    def __init__(self, path=QUEUE_DB):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_post(row):
+        post = json.loads(row["data"])
+        post["id"] = row["id"]
+        for column in _COLUMNS:
+            post[column] = row[column]
+        return post
+
+    @staticmethod
+    def _split(post):
+        """
+        게시글을 (status, repeat_count, repeat_progress, data JSON) 열 값으로 나눕니다.
+        검증 없이 가져온 게시글의 반복 값이 숫자가 아니면 기본값으로 저장하고 실패 상태와 사유(error)를 남깁니다.
+        """
+        data = {k: v for k, v in post.items() if k not in _COLUMNS and k != "id"}
+        status = post.get("status", STATUS_PENDING)
+        numbers = []
+        problems = []
+        for field, default in (("repeat_count", 1), ("repeat_progress", 0)):
+            try:
+                numbers.append(int(post.get(field, default) or default))
+            except (TypeError, ValueError):
+                numbers.append(default)
+                problems.append(f"{field}가 숫자가 아닙니다: {post.get(field)}")
+        if problems:
+            status = STATUS_FAILED
+            data["error"] = "; ".join(problems)
+        return (status, *numbers, json.dumps(data, ensure_ascii=False))
+
+    # --- 추가 / 조회 ---
+
+    def add_posts(self, posts, validate=True):
+        """
+        게시글들을 대기열 끝에 추가하고, 새 ID 리스트를 반환합니다.
+        validate=True면 먼저 모두 검증하여 하나라도 API 제한에 맞지 않으면 아무것도 추가하지 않고 PostValidationError를 발생시킵니다.
+        """
+        if validate:
+            for post in posts:
+                check_post(post)
+        with self._lock, self._conn:
+            return self._insert_posts(posts)
+
+    def _insert_posts(self, posts):
+        """self._lock과 트랜잭션을 잡은 상태에서 게시글들을 대기열 끝에 넣습니다."""
+        next_position = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM posts").fetchone()[0]
+        ids = []
+        for offset, post in enumerate(posts):
+            cursor = self._conn.execute(
+                "INSERT INTO posts (position, status, repeat_count, repeat_progress, data) VALUES (?, ?, ?, ?, ?)",
+                (next_position + offset, *self._split(post)),
+            )
+            ids.append(cursor.lastrowid)
+        return ids
+
+    def add_post(self, post, validate=True):
+        return self.add_posts([post], validate=validate)[0]
+
+    def get(self, post_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+        return self._row_to_post(row) if row else None
+
+    def by_status(self, status, limit=None, after_id=None):
+        """
+        해당 상태의 게시글을 대기열 순서대로 반환합니다. (status 인덱스 사용)
+        after_id를 주면 id가 그보다 큰(그 뒤에 추가된) 게시글만 반환합니다.
+        """
+        sql = "SELECT * FROM posts WHERE status = ?"
+        params = [status]
+        if after_id is not None:
+            sql += " AND id > ?"
+            params.append(after_id)
+        sql += " ORDER BY position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    def all(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM posts ORDER BY position").fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    def page(self, offset, limit):
+        """대기열 순서로 offset번째부터 limit건을 반환합니다. (화면에 보이는 구간만 읽을 때 사용)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM posts ORDER BY position LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    def row_of(self, post_id):
+        """게시글이 대기열에서 몇 번째(0부터)인지 반환합니다. 없으면 None."""
+        with self._lock:
+            row = self._conn.execute("SELECT position FROM posts WHERE id = ?", (post_id,)).fetchone()
+            if row is None:
+                return None
+            return self._conn.execute("SELECT COUNT(*) FROM posts WHERE position < ?", (row[0],)).fetchone()[0]
+
+    def count(self, status=None):
+        with self._lock:
+            if status is None:
+                return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM posts WHERE status = ?", (status,)).fetchone()[0]
+
+    # --- 게시글 단위 원자적 갱신 ---
+
+    def update(self, post_id, **fields):
+        """게시글 1건의 필드를 갱신합니다. (해당 행만 한 트랜잭션으로 기록)"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"게시글을 찾을 수 없습니다: {post_id}")
+            post = self._row_to_post(row)
+            post.update(fields)
+            self._conn.execute(
+                "UPDATE posts SET status = ?, repeat_count = ?, repeat_progress = ?, data = ? WHERE id = ?",
+                (*self._split(post), post_id),
+            )
+            return post
+
+    def set_status(self, post_id, status):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE posts SET status = ? WHERE id = ?", (status, post_id))
+
+    def advance_repeat(self, post_id):
+        """
+        반복 진행 횟수를 1 늘리고, repeat_count에 도달하면 완료 상태로 바꿉니다.
+        갱신된 게시글을 반환합니다.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE posts SET repeat_progress = repeat_progress + 1, "
+                "status = CASE WHEN repeat_progress + 1 >= repeat_count THEN ? ELSE ? END WHERE id = ?",
+                (STATUS_DONE, STATUS_PENDING, post_id),
+            )
+        return self.get(post_id)
+
+    def reject_invalid(self, post):
+        """
+        게시글을 다시 검증하여, 문제가 있으면 실패 상태와 사유(error)를 기록하고 False를 반환합니다.
+        (예약/게시 직전에 호출하여 파일 삭제 등으로 게시할 수 없게 된 게시글을 업로드/API 요청 없이 걸러냄)
+        """
+        problems = validate_post(post)
+        if not problems:
+            return True
+        message = "; ".join(problems)
+        print(f"[PostQueue] 게시글 #{post['id']} 게시 불가: {message}")
+        self.update(post["id"], status=STATUS_FAILED, error=message)
+        return False
+
+    def delete(self, post_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+
+    def delete_by_status(self, status):
+        """해당 상태의 게시글을 모두 지우고, 지운 개수를 반환합니다. (예: 완료된 게시글 자동 삭제)"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM posts WHERE status = ?", (status,)).rowcount
+
+    # --- 유지보수 ---
+
+    def compact(self):
+        """삭제로 생긴 position 간격을 0부터 다시 매기고 데이터베이스 파일을 정리(VACUUM)합니다."""
+        with self._lock:
+            with self._conn:
+                ids = [row[0] for row in self._conn.execute("SELECT id FROM posts ORDER BY position")]
+                self._conn.executemany("UPDATE posts SET position = ? WHERE id = ?",
+                                       [(position, post_id) for position, post_id in enumerate(ids)])
+            self._conn.execute("VACUUM")
+
+    def import_posts_json(self, path=POSTS_FILE, force=False):
+        """
+        기존 posts.json 배열을 대기열로 한 번만 가져옵니다.
+        이미 가져온 적이 있으면(force=False) 아무것도 하지 않고 0을 반환합니다.
+        게시글 추가와 가져온 기록(meta)은 한 트랜잭션으로 저장되어, 중간에 종료되어도 중복으로 가져오지 않습니다.
+        """
+        if not os.path.exists(path):
+            return 0
+        with self._lock:
+            imported = self._conn.execute("SELECT value FROM meta WHERE key = 'imported_posts_json'").fetchone()
+            if imported and not force:
+                return 0
+            with open(path, "r", encoding="utf-8") as f:
+                posts = json.load(f)
+            # 기존 posts.json은 그대로 가져오고, 문제가 있는 게시글은 예약 시점에 실패로 표시됩니다.
+            with self._conn:
+                ids = self._insert_posts(posts)
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_posts_json', ?)",
+                                   (os.path.abspath(path),))
+            return len(ids)
+
+    def export_posts_json(self, path=POSTS_FILE):
+        """대기열을 기존 posts.json 형식(id 제외)으로 내보냅니다."""
+        posts = [{k: v for k, v in post.items() if k != "id"} for post in self.all()]
+        write_json_atomic(path, posts, indent=4)
+
+
+def open_queue(path=QUEUE_DB, posts_json=POSTS_FILE):
+    """대기열을 열고, 처음 여는 경우 posts.json을 가져옵니다."""
+    store = PostQueueStore(path)
+    count = store.import_posts_json(posts_json)
+    if count:
+        print(f"[PostQueue] {posts_json}에서 게시글 {count}건을 가져왔습니다.")
+    return store
@@ -0,0 +1,111 @@
+"""
+게시글 사전 검증.
+업로드나 API 호출을 하기 전에 미디어 개수, 형식, 로컬 파일 존재/크기, 본문 길이를 Threads API 제한과 비교합니다.
+대기열 추가(PostQueueStore.add_posts)와 예약/게시 직전(PostQueueStore.reject_invalid) 시점에 실행됩니다.
+"""
+import os
+from datetime import datetime
+from urllib.parse import urlparse
+
+from media_preprocess import (
+    CONVERTIBLE_IMAGE_EXTENSIONS, IMAGE_EXTENSIONS, MAX_IMAGE_BYTES, MAX_VIDEO_BYTES, VIDEO_EXTENSIONS, Image,
+    get_preprocessor,
+)
+
+# Threads API 제한
+MAX_TEXT_LENGTH = 500
+MAX_CAROUSEL_ITEMS = 20
+
+
+class PostValidationError(ValueError):
+    """API 제한에 맞지 않아 대기열에 넣거나 예약할 수 없는 게시글"""
+
+    def __init__(self, problems, title=""):
+        label = f"'{title}' " if title else ""
+        super().__init__(f"게시글 {label}검증 실패: " + "; ".join(problems))
+        self.problems = problems
+
+
+def _can_convert_images():
+    """전처리가 켜져 있고 Pillow가 있으면 큰 이미지/다른 형식도 업로드 전에 맞출 수 있습니다."""
+    return Image is not None and get_preprocessor() is not None
+
+
+def parse_due_time(value, default=None):
+    """scheduled_at 값(ISO 문자열 또는 epoch 초)을 epoch 초로 변환합니다. 비어 있으면 default, 형식이 틀리면 ValueError."""
+    if value in (None, ""):
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return datetime.strptime(str(value), "%Y-%m-%d %H:%M").timestamp()
+
+
+def _check_file(path):
+    if not os.path.isfile(path):
+        return [f"파일이 존재하지 않습니다: {path}"]
+    ext = os.path.splitext(path)[1].lower()
+    size = os.path.getsize(path)
+    if ext in VIDEO_EXTENSIONS:
+        if size > MAX_VIDEO_BYTES:
+            return [f"동영상이 1GB를 넘습니다: {path}"]
+        return []
+    if ext in IMAGE_EXTENSIONS:
+        if size > MAX_IMAGE_BYTES and not _can_convert_images():
+            return [f"이미지가 8MB를 넘습니다: {path}"]
+        return []
+    if ext in CONVERTIBLE_IMAGE_EXTENSIONS and _can_convert_images():
+        return []
+    return [f"지원하지 않는 미디어 형식입니다 (JPEG/PNG/MP4/MOV): {path}"]
+
+
+def _check_url(url, field):
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return [f"{field}이(가) 올바른 URL이 아닙니다: {url}"]
+    return []
+
+
+def validate_post(post):
+    """게시글의 문제 목록을 반환합니다. 빈 리스트면 게시 가능."""
+    problems = []
+    media_files = post.get("media_files") or []
+    for path in media_files:
+        problems.extend(_check_file(path))
+    if post.get("image_url"):
+        problems.extend(_check_url(post["image_url"], "image_url"))
+    if post.get("video_url"):
+        problems.extend(_check_url(post["video_url"], "video_url"))
+
+    item_count = len(media_files) + bool(post.get("image_url")) + bool(post.get("video_url"))
+    if item_count > MAX_CAROUSEL_ITEMS:
+        problems.append(f"캐러셀은 최대 {MAX_CAROUSEL_ITEMS}개의 미디어만 포함할 수 있습니다 (현재 {item_count}개)")
+
+    text = post.get("content") or post.get("title") or ""
+    if len(text) > MAX_TEXT_LENGTH:
+        problems.append(f"본문이 {MAX_TEXT_LENGTH}자를 넘습니다 (현재 {len(text)}자)")
+    if item_count == 0 and not text.strip():
+        problems.append("본문과 미디어가 모두 비어 있습니다")
+
+    try:
+        parse_due_time(post.get("scheduled_at"))
+    except ValueError:
+        problems.append(f"scheduled_at 형식이 올바르지 않습니다 (예: 2024-01-31 09:00): {post.get('scheduled_at')}")
+
+    try:
+        repeat_count = int(post.get("repeat_count", 1) or 1)
+        if repeat_count < 1:
+            problems.append(f"repeat_count는 1 이상이어야 합니다: {repeat_count}")
+    except (TypeError, ValueError):
+        problems.append(f"repeat_count가 숫자가 아닙니다: {post.get('repeat_count')}")
+    return problems
+
+
+def check_post(post):
+    """문제가 있으면 PostValidationError를 발생시킵니다."""
+    problems = validate_post(post)
+    if problems:
+        raise PostValidationError(problems, post.get("title", ""))
+
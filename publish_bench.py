@@ -0,0 +1,166 @@
+"""
+게시 처리량 벤치마크.
+graph_standin_server 대역 서버를 띄우고 Graph API/Catbox 주소를 그쪽으로 돌린 뒤,
+실제 헬퍼 모듈(catbox_uploader, threads_api_helper, threads_carousel_helper)로 게시글을 게시하여
+분당 게시 수와 단계별 지연(p50/p95/max)을 측정합니다.
+
+사용법:
+    python publish_bench.py --posts 40 --workers 4 --mix text,image,carousel,video
+    python publish_bench.py --video-ms 5000 --error-subcode 4279009 --error-rate 0.05
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import catbox_uploader
+import publish_trace
+import threads_api_helper
+import threads_carousel_helper
+import threads_graph_client
+import upload_cache
+from graph_standin_server import API_PREFIX, CATBOX_PATH, StandinConfig, start_in_background
+from publish_trace import configure_tracer, print_summary
+from threads_graph_client import configure_client
+from upload_cache import configure_cache
+
+BENCH_API_ID = "17841400000000000"
+BENCH_TOKEN = "standin-token"
+POST_KINDS = ("text", "image", "video", "carousel")
+
+
+def _make_media_files(directory, prefix, count, size_kb, suffix):
+    """서로 다른 내용의 임시 미디어 파일을 만듭니다. (업로드 캐시에 걸리지 않도록)"""
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"{prefix}_{index}{suffix}")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size_kb * 1024))
+        paths.append(path)
+    return paths
+
+
+def _publish_one(kind, index, media, carousel_size):
+    text = f"벤치마크 게시글 #{index} ({kind})"
+    if kind == "text":
+        ok, result = threads_api_helper.post_text(BENCH_API_ID, BENCH_TOKEN, text)
+    elif kind == "image":
+        url = catbox_uploader.upload_file(media["image"][index])
+        ok, result = threads_api_helper.post_single_image(BENCH_API_ID, BENCH_TOKEN, url, text)
+    elif kind == "video":
+        url = catbox_uploader.upload_file(media["video"][index])
+        ok, result = threads_api_helper.post_video(BENCH_API_ID, BENCH_TOKEN, url, text)
+    else:
+        start = index * carousel_size
+        files = media["carousel"][start:start + carousel_size]
+        items = threads_carousel_helper.media_items_from_files(files)
+        return threads_carousel_helper.post_carousel(BENCH_API_ID, BENCH_TOKEN, items, text)
+    if not ok:
+        raise Exception(result)
+    return result
+
+
+def run_benchmark(posts=20, workers=4, mix=POST_KINDS, carousel_size=5, file_kb=256, config=None, verbose=False):
+    """벤치마크를 실행하고 결과 딕셔너리(posts_per_minute, failures, stages, ...)를 반환합니다."""
+    config = config or StandinConfig(quota_total=posts * 10)
+    server, root = start_in_background(config)
+    workdir = tempfile.mkdtemp(prefix="publish_bench_")
+    # 벤치마크가 끝나면 공용 클라이언트/캐시/Tracer와 Catbox 주소를 원래대로 되돌림
+    previous = (threads_graph_client._client, upload_cache._cache, publish_trace._tracer,
+                catbox_uploader.CATBOX_UPLOAD_URL)
+    tracer = None
+    try:
+        configure_client(base_url=f"{root}{API_PREFIX}")
+        catbox_uploader.CATBOX_UPLOAD_URL = f"{root}{CATBOX_PATH}"
+        configure_cache(path=os.path.join(workdir, "catbox_cache.json"))
+        tracer = configure_tracer(path=os.path.join(workdir, "publish_trace.jsonl"))
+
+        kinds = [mix[i % len(mix)] for i in range(posts)]
+        media = {
+            "image": _make_media_files(workdir, "image", posts, file_kb, ".jpg"),
+            "video": _make_media_files(workdir, "video", posts, file_kb * 4, ".mp4"),
+            "carousel": _make_media_files(workdir, "carousel", posts * carousel_size, file_kb, ".png"),
+        }
+
+        failures = []
+        start = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w", encoding="utf-8"))))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_publish_one, kind, i, media, carousel_size) for i, kind in enumerate(kinds)]
+                for i, future in enumerate(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        failures.append((i, kinds[i], str(e)))
+        elapsed = time.perf_counter() - start
+
+        return {
+            "posts": posts,
+            "elapsed": elapsed,
+            "posts_per_minute": (posts - len(failures)) / elapsed * 60 if elapsed else 0.0,
+            "failures": failures,
+            "requests": server.state.request_count,
+            "uploads": server.state.upload_count,
+            "upload_bytes": server.state.upload_bytes,
+            "stages": tracer.summary(),
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+        bench_client = threads_graph_client.get_client()
+        with threads_graph_client._client_lock:
+            threads_graph_client._client = previous[0]
+        bench_client.close()
+        with upload_cache._cache_lock:
+            upload_cache._cache = previous[1]
+        with publish_trace._tracer_lock:
+            publish_trace._tracer = previous[2]
+        if tracer is not None:
+            tracer.close()
+        catbox_uploader.CATBOX_UPLOAD_URL = previous[3]
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대역 서버를 이용한 게시 처리량 벤치마크")
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mix", default=",".join(POST_KINDS), help="게시 유형 순환 목록 (text,image,video,carousel)")
+    parser.add_argument("--carousel-size", type=int, default=5)
+    parser.add_argument("--file-kb", type=int, default=256, help="이미지 파일 크기(KB), 동영상은 4배")
+    parser.add_argument("--latency", type=int, default=30, help="대역 서버 요청 지연(ms)")
+    parser.add_argument("--image-ms", type=int, default=200, help="IMAGE 컨테이너 IN_PROGRESS 시간(ms)")
+    parser.add_argument("--video-ms", type=int, default=2000, help="VIDEO 컨테이너 IN_PROGRESS 시간(ms)")
+    parser.add_argument("--error-subcode", type=int)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reject-auto-publish", action="store_true", help="텍스트 게시의 2단계 대체 경로 측정")
+    parser.add_argument("--verbose", action="store_true", help="헬퍼 모듈의 로그 출력을 그대로 표시")
+    args = parser.parse_args(argv)
+
+    mix = tuple(kind.strip() for kind in args.mix.split(",") if kind.strip())
+    unknown = [kind for kind in mix if kind not in POST_KINDS]
+    if unknown:
+        parser.error(f"알 수 없는 게시 유형: {', '.join(unknown)}")
+
+    config = StandinConfig(args.latency, args.image_ms, args.video_ms, error_subcode=args.error_subcode,
+                           error_rate=args.error_rate, quota_total=args.posts * 10,
+                           auto_publish_text=not args.reject_auto_publish)
+    result = run_benchmark(args.posts, args.workers, mix, args.carousel_size, args.file_kb, config, args.verbose)
+
+    print(f"게시 {result['posts']}건 / {result['elapsed']:.2f}초 → {result['posts_per_minute']:.1f} posts/min")
+    print(f"요청 {result['requests']}회, Catbox 업로드 {result['uploads']}회 ({result['upload_bytes'] / 1024 / 1024:.1f} MB)")
+    for index, kind, error in result["failures"]:
+        print(f"  실패 #{index} ({kind}): {error}")
+    print()
+    print_summary(result["stages"])
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config_store import write_json_atomic
+from threads_errors import ContainerStatusError
+from threads_graph_client import FAILED_STATUSES
+
+CHECKPOINT_DIR = "checkpoints"
+
+# Threads 미디어 컨테이너는 생성 후 24시간이 지나면 만료됩니다. 여유를 두고 23시간까지만 재사용합니다.
+CONTAINER_TTL = 23 * 60 * 60
+
+
+class PublishCheckpoint:
+    """
+    게시글 1건의 게시 진행 상태.
+    업로드된 URL, 하위 컨테이너 ID, 최종(캐러셀/단일) 컨테이너 ID, 게시 결과를 단계마다 디스크에 기록합니다.
+    """
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {
+            "created_at": time.time(),
+            "uploads": {},
+            "children": {},
+            "container_id": None,
+            "result": None,
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def containers_valid(self):
+        """저장된 컨테이너 ID를 아직 재사용할 수 있는지 (만료 전인지) 여부"""
+        return time.time() - self.data["created_at"] < CONTAINER_TTL
+
+    def get_upload(self, index):
+        return self.data["uploads"].get(str(index))
+
+    def set_upload(self, index, url):
+        with self._lock:
+            self.data["uploads"][str(index)] = url
+            self._save()
+
+    def get_child(self, index):
+        return self.data["children"].get(str(index)) if self.containers_valid else None
+
+    def set_child(self, index, container_id):
+        with self._lock:
+            self.data["children"][str(index)] = container_id
+            self._save()
+
+    def get_container(self):
+        return self.data["container_id"] if self.containers_valid else None
+
+    def set_container(self, container_id):
+        with self._lock:
+            self.data["container_id"] = container_id
+            self._save()
+
+    def reset_containers(self):
+        """하위/최종 컨테이너 ID를 지웁니다. (업로드된 URL은 유지) 다음 시도에서 컨테이너를 새로 만듭니다."""
+        with self._lock:
+            self.data["created_at"] = time.time()
+            self.data["children"] = {}
+            self.data["container_id"] = None
+            self._save()
+
+    @property
+    def result(self):
+        """이미 게시가 끝났다면 그 결과 (중복 게시 방지용)"""
+        return self.data["result"]
+
+    def set_result(self, result):
+        with self._lock:
+            self.data["result"] = result
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        write_json_atomic(self.path, self.data, indent=2)
+
+
+def discard_failed_containers(checkpoint, error):
+    """
+    컨테이너가 ERROR/EXPIRED 상태로 실패했다면 체크포인트의 컨테이너 ID를 지웁니다.
+    그대로 두면 재시도할 때마다 같은 실패한 컨테이너를 재사용하게 됩니다.
+    """
+    if checkpoint and isinstance(error, ContainerStatusError) and error.status in FAILED_STATUSES:
+        print(f"[Checkpoint] 컨테이너 {error.container_id}가 {error.status} 상태라 다음 시도에서 새로 만듭니다.")
+        checkpoint.reset_containers()
+
+
+class CheckpointStore:
+    """CHECKPOINT_DIR 아래에 게시글별 체크포인트 파일을 관리합니다."""
+
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        """
+        key에 해당하는 체크포인트를 불러옵니다.
+        파일이 없거나 손상되었거나, 아직 게시되지 않았는데 컨테이너가 만료되었다면 새로 시작합니다.
+        """
+        path = self._path(key)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    checkpoint = PublishCheckpoint(path, json.load(f))
+                if checkpoint.result or checkpoint.containers_valid:
+                    return checkpoint
+                # 컨테이너는 만료되었지만 Catbox URL은 계속 유효하므로 업로드 결과만 이어받습니다.
+                fresh = PublishCheckpoint(path)
+                fresh.data["uploads"] = checkpoint.data.get("uploads", {})
+                return fresh
+            except Exception as e:
+                print(f"[Checkpoint] 체크포인트를 읽지 못해 새로 시작합니다: {path} ({e})")
+        return PublishCheckpoint(path)
+
+    def remove(self, key):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def checkpoint_key(api_id, text, media_items, run_id=""):
+    """계정, 본문, 미디어 목록(그리고 반복 회차 등 run_id)으로 게시글을 식별하는 키를 만듭니다."""
+    media = [(item.get("type", ""), item.get("url") or item.get("path") or "") for item in media_items]
+    raw = json.dumps([api_id, text, media, run_id], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
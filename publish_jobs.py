@@ -0,0 +1,179 @@
+"""
+Qt 앱용 API 게시 작업 실행기.
+게시 작업(게시글 1건 × 계정 1개)을 크기가 제한된 워커 풀에서 실행하고, 계정별 동시 실행 수를 제한합니다.
+작업은 대기 중이면 바로, 실행 중이면 다음 대기/확인 시점에 취소되며, 진행 상황과 결과는 Qt 시그널로 전달됩니다.
+
+사용 예:
+    runner = PublishJobRunner()
+    runner.job_finished.connect(on_job_finished)   # (job_id, status, message)
+    job_id = runner.submit(post, account)
+    runner.cancel(job_id)
+"""
+import itertools
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import pyqtSignal
+
+from config_store import get_settings_store
+from headless_publisher import ACCOUNTS_FILE, publish_for_account
+from publish_checkpoint import CheckpointStore
+from publish_quota import get_quota_tracker
+from threads_errors import PublishCancelledError
+from token_manager import TokenManager
+
+JOB_PENDING = "대기중"
+JOB_RUNNING = "진행중"
+JOB_DONE = "완료"
+JOB_FAILED = "실패"
+JOB_CANCELLED = "취소됨"
+
+# 한 계정에서 동시에 진행할 수 있는 게시 작업 수
+DEFAULT_PER_ACCOUNT_LIMIT = 1
+
+
+class PublishJob:
+    def __init__(self, job_id, post, account, repeat_index=0):
+        self.id = job_id
+        self.post = post
+        self.account = account
+        self.repeat_index = repeat_index
+        self.status = JOB_PENDING
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def account_key(self):
+        return self.account["api_id"]
+
+    def label(self):
+        return f"#{self.post.get('id')} → {self.account.get('username') or self.account_key}"
+
+
+class PublishJobRunner(QtCore.QObject):
+    """
+    게시 작업 실행기.
+    max_workers를 주지 않으면 settings.json의 concurrent_limit을 전체 동시 실행 수로 사용합니다.
+    시그널은 워커 스레드에서 발생하지만 Qt가 수신 객체의 스레드(GUI)로 전달합니다.
+    """
+
+    job_started = pyqtSignal(int)
+    job_progress = pyqtSignal(int, str)
+    job_finished = pyqtSignal(int, str, str)  # job_id, 상태(JOB_DONE/JOB_FAILED/JOB_CANCELLED), 결과 또는 오류 메시지
+    idle = pyqtSignal()
+
+    def __init__(self, max_workers=None, per_account_limit=DEFAULT_PER_ACCOUNT_LIMIT, accounts_path=ACCOUNTS_FILE, parent=None):
+        super().__init__(parent)
+        if max_workers is None:
+            max_workers = int(get_settings_store().get("concurrent_limit", 1) or 1)
+        self.max_workers = max(1, max_workers)
+        self.per_account_limit = max(1, per_account_limit)
+        self.checkpoints = CheckpointStore()
+        self.quota = get_quota_tracker()
+        self.tokens = TokenManager(accounts_path)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="PublishJob")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._queue = deque()
+        self._running = Counter()
+
+    # --- 작업 추가/취소 ---
+
+    def submit(self, post, account, repeat_index=0):
+        """게시 작업을 대기열에 추가하고 작업 ID를 반환합니다."""
+        with self._lock:
+            job = PublishJob(next(self._ids), post, account, repeat_index)
+            self._jobs[job.id] = job
+            self._queue.append(job)
+        self.job_progress.emit(job.id, f"대기열 추가: {job.label()}")
+        self._dispatch()
+        return job.id
+
+    def cancel(self, job_id):
+        """작업을 취소합니다. 대기 중이면 즉시, 실행 중이면 다음 대기/확인 시점에 중단됩니다."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (JOB_PENDING, JOB_RUNNING):
+                return False
+            job.cancel_event.set()
+            was_pending = job.status == JOB_PENDING
+            if was_pending:
+                self._queue.remove(job)
+                job.status = JOB_CANCELLED
+        if was_pending:
+            self.job_finished.emit(job.id, JOB_CANCELLED, "대기 중 취소")
+            self._emit_idle_if_done()
+        else:
+            self.job_progress.emit(job.id, "취소 요청됨, 현재 단계가 끝나면 중단합니다.")
+        return True
+
+    def cancel_all(self):
+        with self._lock:
+            job_ids = [job.id for job in self._jobs.values() if job.status in (JOB_PENDING, JOB_RUNNING)]
+        for job_id in job_ids:
+            self.cancel(job_id)
+
+    def job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def clear_finished(self):
+        """끝난 작업(완료/실패/취소)의 기록을 지웁니다."""
+        with self._lock:
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if job.status in (JOB_PENDING, JOB_RUNNING)}
+
+    def active_count(self):
+        """대기 중이거나 실행 중인 작업 수"""
+        with self._lock:
+            return len(self._queue) + sum(self._running.values())
+
+    def shutdown(self, wait=False):
+        """모든 작업을 취소하고 워커 풀을 종료합니다. (창을 닫을 때 호출)"""
+        self.cancel_all()
+        self._executor.shutdown(wait=wait)
+
+    # --- 실행 ---
+
+    def _dispatch(self):
+        """전체/계정별 실행 한도 안에서 대기 중인 작업을 워커 풀에 넘깁니다."""
+        started = []
+        with self._lock:
+            for job in list(self._queue):
+                if sum(self._running.values()) >= self.max_workers:
+                    break
+                if self._running[job.account_key] >= self.per_account_limit:
+                    continue
+                self._queue.remove(job)
+                self._running[job.account_key] += 1
+                job.status = JOB_RUNNING
+                started.append(job)
+        for job in started:
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        self.job_started.emit(job.id)
+        self.job_progress.emit(job.id, f"게시 시작: {job.label()}")
+        try:
+            job.result = publish_for_account(job.post, job.account, job.repeat_index, self.checkpoints,
+                                             self.tokens, self.quota, cancel_event=job.cancel_event)
+            status, message = JOB_DONE, str(job.result)
+        except PublishCancelledError as e:
+            status, message = JOB_CANCELLED, str(e)
+        except Exception as e:
+            job.error = e
+            status = JOB_CANCELLED if job.cancel_event.is_set() else JOB_FAILED
+            message = str(e)
+        with self._lock:
+            job.status = status
+            self._running[job.account_key] -= 1
+        self.job_finished.emit(job.id, status, message)
+        self._dispatch()
+        self._emit_idle_if_done()
+
+    def _emit_idle_if_done(self):
+        if self.active_count() == 0:
+            self.idle.emit()
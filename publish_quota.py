@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from threads_errors import ThreadsAPIError
+from threads_graph_client import get_client
+
+# threads_publishing_limit 조회 결과를 재사용할 시간(초)
+DEFAULT_TTL = 5 * 60
+
+# 조회에 실패했을 때 가정하는 24시간 게시 한도 (Threads 기본값)
+DEFAULT_QUOTA_TOTAL = 250
+
+
+class QuotaExceededError(ThreadsAPIError):
+    """게시 한도를 넘게 되어 업로드/컨테이너 생성 전에 게시를 보류한 경우"""
+
+    def __init__(self, api_id, used, total):
+        super().__init__(f"게시 한도 초과로 보류: {api_id} ({used}/{total})")
+        self.api_id = api_id
+        self.used = used
+        self.total = total
+
+
+class _AccountQuota:
+    def __init__(self, used, total, fetched_at):
+        self.used = used
+        self.total = total
+        self.fetched_at = fetched_at
+        self.reserved = 0
+
+
+class QuotaTracker:
+    """
+    계정별 게시 한도 추적기.
+    threads_publishing_limit 조회 결과를 ttl초 동안 캐시하고, 그 사이의 게시 성공은 로컬에서 더해 나갑니다.
+    진행 중인 게시는 reserved로 잡아 두어 동시에 여러 게시가 한도를 넘지 않도록 합니다.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._accounts = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def refresh(self, api_id, access_token, proxies=None):
+        """서버에서 현재 사용량/한도를 다시 읽어 옵니다."""
+        params = {"fields": "quota_usage,config", "access_token": access_token}
+        try:
+            result = get_client().get(f"{api_id}/threads_publishing_limit", params=params, proxies=proxies)
+            data = (result.get("data") or [{}])[0]
+            used = int(data.get("quota_usage", 0) or 0)
+            total = int((data.get("config") or {}).get("quota_total", DEFAULT_QUOTA_TOTAL))
+        except ThreadsAPIError as e:
+            print(f"[Quota] 게시 한도 조회 실패, 로컬 기록으로 판단합니다: {api_id} ({e})")
+            with self._lock:
+                known = self._accounts.get(api_id)
+                used = known.used if known else 0
+                total = known.total if known else DEFAULT_QUOTA_TOTAL
+        with self._lock:
+            quota = self._accounts.get(api_id)
+            if quota is None:
+                quota = self._accounts[api_id] = _AccountQuota(used, total, time.monotonic())
+            else:
+                quota.used, quota.total, quota.fetched_at = used, total, time.monotonic()
+            return quota
+
+    def _get(self, api_id, access_token, proxies=None):
+        with self._lock:
+            quota = self._accounts.get(api_id)
+        if quota is None or time.monotonic() - quota.fetched_at > self.ttl:
+            quota = self.refresh(api_id, access_token, proxies=proxies)
+        return quota
+
+    def remaining(self, api_id, access_token, proxies=None):
+        """진행 중인 게시까지 고려한 남은 게시 가능 횟수"""
+        quota = self._get(api_id, access_token, proxies=proxies)
+        with self._lock:
+            return quota.total - quota.used - quota.reserved
+
+    def try_reserve(self, api_id, access_token, proxies=None, count=1):
+        """한도 안이면 count건을 예약하고 True, 아니면 False를 반환합니다."""
+        quota = self._get(api_id, access_token, proxies=proxies)
+        with self._lock:
+            if quota.used + quota.reserved + count > quota.total:
+                return False
+            quota.reserved += count
+            return True
+
+    def release(self, api_id, count=1):
+        """게시하지 못한 예약을 돌려놓습니다."""
+        with self._lock:
+            quota = self._accounts.get(api_id)
+            if quota is not None:
+                quota.reserved = max(0, quota.reserved - count)
+
+    def _published_counts(self):
+        """현재 스레드에서 record_publish가 불린 횟수 (admit이 쓰지 않은 예약을 계산할 때 사용)"""
+        counts = getattr(self._local, "published", None)
+        if counts is None:
+            counts = self._local.published = Counter()
+        return counts
+
+    def record_publish(self, api_id):
+        """게시 성공 1건을 로컬 사용량에 반영합니다. (_publish_container 성공 시 호출)"""
+        self._published_counts()[api_id] += 1
+        with self._lock:
+            quota = self._accounts.get(api_id)
+            if quota is not None:
+                quota.used += 1
+                quota.reserved = max(0, quota.reserved - 1)
+
+    @contextmanager
+    def admit(self, api_id, access_token, proxies=None, count=1):
+        """
+        게시 작업 전체를 감싸는 입장 제어.
+        한도를 넘으면 업로드 등 어떤 작업도 시작하기 전에 QuotaExceededError를 발생시키고,
+        작업이 끝나면(실패하거나, 체크포인트의 결과를 돌려주는 등 게시하지 않고 끝난 경우 포함)
+        그 사이 record_publish로 쓰이지 않은 예약을 돌려놓습니다.
+        """
+        if not self.try_reserve(api_id, access_token, proxies=proxies, count=count):
+            quota = self._get(api_id, access_token, proxies=proxies)
+            raise QuotaExceededError(api_id, quota.used + quota.reserved, quota.total)
+        counts = self._published_counts()
+        published_before = counts[api_id]
+        try:
+            yield
+        finally:
+            unused = count - (counts[api_id] - published_before)
+            if unused > 0:
+                self.release(api_id, unused)
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_quota_tracker():
+    """공용 QuotaTracker 인스턴스를 반환합니다."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = QuotaTracker()
+        return _tracker
@@ -0,0 +1,156 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from post_queue_store import STATUS_FAILED, STATUS_PENDING
+from post_validation import parse_due_time
+
+# 반복 게시 간격 기본값(초). 게시글에 repeat_interval_minutes가 있으면 그 값을 사용합니다.
+DEFAULT_REPEAT_SPACING = 60 * 60
+
+# 시각이 된 게시글을 동시에 처리할 최대 개수
+DEFAULT_MAX_WORKERS = 2
+
+
+class PublishScheduler:
+    """
+    게시글별 예약 시각을 힙(heap)으로 관리하는 스케줄러.
+    백그라운드 스레드는 가장 가까운 예약 시각까지만 잠들었다가, 시각이 된 게시글만 워커 풀의 handler(post_id, repeat_index)로 넘깁니다.
+    게시가 오래 걸려도 타이밍 스레드는 막히지 않으므로 다른 게시글의 예약 시각을 놓치지 않습니다.
+    """
+
+    def __init__(self, handler, max_workers=DEFAULT_MAX_WORKERS):
+        self.handler = handler
+        self.max_workers = max(1, max_workers)
+        self._executor = None
+        self._post_locks = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    # --- 예약 ---
+
+    def schedule(self, post_id, due_at, repeat_index=0):
+        """post_id의 repeat_index번째 게시를 due_at(epoch 초)에 예약합니다."""
+        with self._cond:
+            heapq.heappush(self._heap, (due_at, next(self._seq), post_id, repeat_index))
+            self._cond.notify()
+
+    def schedule_post(self, post, now=None, spacing=DEFAULT_REPEAT_SPACING):
+        """
+        게시글의 scheduled_at(없으면 지금)부터 남은 반복 횟수(repeat_count - repeat_progress)만큼
+        spacing초(또는 게시글의 repeat_interval_minutes) 간격으로 예약합니다. 예약한 개수를 반환합니다.
+        """
+        now = time.time() if now is None else now
+        first_due = parse_due_time(post.get("scheduled_at"), default=now)
+        if post.get("repeat_interval_minutes"):
+            spacing = float(post["repeat_interval_minutes"]) * 60
+        repeat_count = int(post.get("repeat_count", 1) or 1)
+        repeat_progress = int(post.get("repeat_progress", 0) or 0)
+        scheduled = 0
+        for offset, repeat_index in enumerate(range(repeat_progress, repeat_count)):
+            self.schedule(post["id"], max(first_due, now) + offset * spacing, repeat_index)
+            scheduled += 1
+        return scheduled
+
+    def schedule_stored_post(self, store, post, now=None, spacing=DEFAULT_REPEAT_SPACING):
+        """
+        PostQueueStore의 게시글을 검증한 뒤 예약합니다. 예약한 개수를 반환합니다.
+        검증에 실패하거나 scheduled_at을 해석할 수 없으면 실패 상태와 사유를 기록하고 0을 반환합니다.
+        """
+        if not store.reject_invalid(post):
+            return 0
+        try:
+            return self.schedule_post(post, now=now, spacing=spacing)
+        except ValueError as e:
+            message = f"예약 정보를 해석할 수 없습니다: {e}"
+            print(f"[Scheduler] 게시글 #{post['id']} 예약 실패: {message}")
+            store.update(post["id"], status=STATUS_FAILED, error=message)
+            return 0
+
+    def schedule_queue(self, store, status=STATUS_PENDING, spacing=DEFAULT_REPEAT_SPACING):
+        """PostQueueStore에서 해당 상태의 게시글을 모두 예약합니다. (검증/예약에 실패한 게시글은 실패로 표시하고 건너뜀)"""
+        now = time.time()
+        return sum(self.schedule_stored_post(store, post, now=now, spacing=spacing) for post in store.by_status(status))
+
+    def cancel(self, post_id):
+        """post_id의 남은 예약을 모두 취소합니다."""
+        with self._cond:
+            self._heap = [entry for entry in self._heap if entry[2] != post_id]
+            heapq.heapify(self._heap)
+
+    def next_due(self):
+        """가장 가까운 예약 시각(epoch 초). 예약이 없으면 None."""
+        with self._cond:
+            return self._heap[0][0] if self._heap else None
+
+    def pending(self):
+        with self._cond:
+            return len(self._heap)
+
+    # --- 실행 ---
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="PublishHandler")
+            self._thread = threading.Thread(target=self._run, name="PublishScheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait=True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+            self._thread = None
+            executor = self._executor
+            self._executor = None
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _pop_due(self):
+        """self._cond를 잡은 상태에서, 예약 시각이 지난 항목을 모두 꺼냅니다."""
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, post_id, repeat_index = heapq.heappop(self._heap)
+            due.append((post_id, repeat_index))
+        return due
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    due = self._pop_due()
+                    if due:
+                        break
+                    timeout = self._heap[0][0] - time.time() if self._heap else None
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                executor = self._executor
+            try:
+                for post_id, repeat_index in due:
+                    executor.submit(self._handle, post_id, repeat_index)
+            except RuntimeError:  # stop()으로 워커 풀이 먼저 종료됨
+                return
+
+    def _post_lock(self, post_id):
+        with self._cond:
+            return self._post_locks.setdefault(post_id, threading.Lock())
+
+    def _handle(self, post_id, repeat_index):
+        # 같은 게시글의 여러 회차가 한꺼번에 시각이 되어도 순서대로 하나씩 처리
+        try:
+            with self._post_lock(post_id):
+                self.handler(post_id, repeat_index)
+        except Exception as e:
+            print(f"[Scheduler] 게시 처리 중 오류 (post_id={post_id}, {repeat_index + 1}회차): {e}")
@@ -0,0 +1,182 @@
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+TRACE_FILE = "publish_trace.jsonl"
+
+# 트레이스 파일 회전 기준 (bytes) 과 보관할 이전 파일 수
+MAX_TRACE_BYTES = 5 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+# 단계별 지연 통계에 사용할 최근 기록 수
+SUMMARY_WINDOW = 1000
+
+_ID_SEGMENT = re.compile(r"(?<=/)\d{5,}(?=/|$)")
+
+
+def url_template(url):
+    """URL의 숫자 ID 경로와 쿼리를 지워 통계용 템플릿으로 만듭니다. (예: .../v1.0/{id}/threads)"""
+    return _ID_SEGMENT.sub("{id}", url.split("?", 1)[0])
+
+
+def _percentile(sorted_values, ratio):
+    index = min(len(sorted_values) - 1, max(0, int(round(ratio * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class Tracer:
+    """
+    게시 파이프라인 계측기.
+    단계(upload, create_container, wait_ready, publish 등)와 HTTP 호출마다 소요 시간을 기록하여
+    회전되는 JSONL 파일에 남기고, 단계별 p50/p95/max 지연 통계를 메모리에 유지합니다.
+    """
+
+    def __init__(self, path=TRACE_FILE, max_bytes=MAX_TRACE_BYTES, backup_count=TRACE_BACKUP_COUNT, window=SUMMARY_WINDOW):
+        self.path = path
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._logger = logging.getLogger(f"publish_trace.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._handler = None
+        if path:
+            self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+            self._handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(self._handler)
+
+    def _record(self, record):
+        with self._lock:
+            self._durations[record["stage"]].append(record["duration"])
+        if self._handler:
+            self._logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+    def close(self):
+        """기록 파일 핸들러를 닫습니다. (임시 디렉터리에 기록한 Tracer를 정리할 때 사용)"""
+        if self._handler:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    @contextmanager
+    def retry_attempt(self, attempt):
+        """
+        with 블록 안에서 현재 스레드가 보내는 HTTP 호출을 attempt번째 재시도로 기록합니다.
+        (post_carousel/post_video의 재시도 루프에서 사용, 0이면 첫 시도)
+        """
+        previous = getattr(self._local, "retries", 0)
+        self._local.retries = attempt
+        try:
+            yield
+        finally:
+            self._local.retries = previous
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """
+        with 블록의 소요 시간을 stage 이름으로 기록합니다.
+        블록 안에서 반환된 딕셔너리에 값을 넣으면 함께 기록됩니다. 예외가 나면 error 필드가 붙습니다.
+        """
+        record = {"type": "span", "stage": stage, "ts": time.time()}
+        record.update(attrs)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["duration"] = time.perf_counter() - start
+            self._record(record)
+
+    def record_http(self, method, url, status, duration, bytes_sent=0, bytes_received=0, retries=None, error=None):
+        """
+        HTTP 호출 1건을 기록합니다. 통계는 'http METHOD 템플릿' 단위로 집계됩니다.
+        retries를 주지 않으면 retry_attempt()로 지정된 현재 스레드의 재시도 횟수를 사용합니다.
+        """
+        if retries is None:
+            retries = getattr(self._local, "retries", 0)
+        template = url_template(url)
+        record = {
+            "type": "http",
+            "stage": f"http {method} {template}",
+            "ts": time.time(),
+            "method": method,
+            "url": template,
+            "status": status,
+            "bytes_sent": bytes_sent,
+            "bytes_received": bytes_received,
+            "retries": retries,
+            "duration": duration,
+        }
+        if error:
+            record["error"] = error
+        self._record(record)
+
+    def summary(self, stage=None):
+        """단계별 {count, p50, p95, max} (초). stage를 주면 해당 단계만 반환합니다."""
+        with self._lock:
+            snapshot = {name: sorted(values) for name, values in self._durations.items()
+                        if values and (stage is None or name == stage)}
+        result = {name: summarize(values) for name, values in snapshot.items()}
+        return result.get(stage) if stage is not None else result
+
+
+def summarize(sorted_values):
+    return {
+        "count": len(sorted_values),
+        "p50": _percentile(sorted_values, 0.50),
+        "p95": _percentile(sorted_values, 0.95),
+        "max": sorted_values[-1],
+    }
+
+
+def summarize_file(path=TRACE_FILE):
+    """JSONL 트레이스 파일을 읽어 단계별 통계를 계산합니다."""
+    durations = defaultdict(list)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            durations[record["stage"]].append(record["duration"])
+    return {stage: summarize(sorted(values)) for stage, values in durations.items()}
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """공용 Tracer 인스턴스를 반환합니다."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+        return _tracer
+
+
+def configure_tracer(**options):
+    """공용 Tracer를 새 설정(path, max_bytes, backup_count, window)으로 교체합니다."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = Tracer(**options)
+        return _tracer
+
+
+def print_summary(summary):
+    print(f"{'stage':<60} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+    for stage in sorted(summary):
+        s = summary[stage]
+        print(f"{stage:<60} {s['count']:>6} {s['p50']:>8.3f} {s['p95']:>8.3f} {s['max']:>8.3f}")
+
+
+if __name__ == "__main__":
+    print_summary(summarize_file(sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE))
@@ -1,83 +1,51 @@
 import requests
-import time
 
-API_BASE_URL = "https://graph.threads.net/v1.0"
+from publish_checkpoint import discard_failed_containers
+from publish_quota import get_quota_tracker
+from publish_trace import get_tracer
+from threads_errors import GraphAPIError, PublishCancelledError, retry_delay, sleep_or_cancel
+from threads_graph_client import API_BASE_URL, DEFAULT_READY_DEADLINE, get_client
 
 def _create_media_container(api_id, access_token, media_type, text=None, image_url=None, video_url=None, is_carousel_item=False, proxies=None):
     """미디어 컨테이너(단일, 캐러셀 아이템, 비디오)를 생성합니다."""
-    url = f"{API_BASE_URL}/{api_id}/threads"
-    data = {
-        "media_type": media_type,
-        "access_token": access_token,
-    }
-    if text:
-        data["text"] = text
-    if image_url:
-        data["image_url"] = image_url
-    if video_url:
-        data["video_url"] = video_url
-    if is_carousel_item:
-        data["is_carousel_item"] = "true"
-
-    try:
-        response = requests.post(url, data=data, proxies=proxies, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
+    with get_tracer().span("create_container", media_type=media_type, carousel_item=is_carousel_item):
+        return get_client().create_media_container(api_id, access_token, media_type, text=text, image_url=image_url, video_url=video_url, is_carousel_item=is_carousel_item, proxies=proxies)
 
 def _create_carousel_container(api_id, access_token, children_ids, text, proxies=None):
     """캐러셀 컨테이너를 생성합니다."""
-    url = f"{API_BASE_URL}/{api_id}/threads"
-    data = {
-        "media_type": "CAROUSEL",
-        "children": ",".join(children_ids),
-        "text": text,
-        "access_token": access_token
-    }
-    try:
-        response = requests.post(url, data=data, proxies=proxies, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
+    with get_tracer().span("create_carousel", children=len(children_ids)):
+        return get_client().create_carousel_container(api_id, access_token, children_ids, text, proxies=proxies)
+
+def _create_text_post(api_id, access_token, text, proxies=None):
+    """텍스트 게시글을 auto_publish_text로 한 번에 게시합니다. (성공 시 계정 게시 한도 사용량 반영)"""
+    with get_tracer().span("publish_text"):
+        result = get_client().create_text_post(api_id, access_token, text, proxies=proxies)
+    get_quota_tracker().record_publish(api_id)
+    return result
 
+def _auto_publish_rejected(error):
+    """auto_publish_text 요청이 파라미터 오류(code 100)로 거부되었는지 확인합니다."""
+    return isinstance(error, GraphAPIError) and error.http_status == 400 and error.code == 100 and error.subcode is None
 
 def _get_container_status(container_id, access_token, proxies=None):
     """미디어 컨테이너의 처리 상태를 확인합니다."""
-    url = f"{API_BASE_URL}/{container_id}"
-    params = {
-        "fields": "status_code",
-        "access_token": access_token
-    }
-    try:
-        response = requests.get(url, params=params, proxies=proxies, timeout=10)
-        response.raise_for_status()
-        return response.json().get("status_code")
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
+    return get_client().get_container_status(container_id, access_token, proxies=proxies)
+
+def _get_container_statuses(container_ids, access_token, proxies=None):
+    """여러 컨테이너의 처리 상태를 한 번의 요청으로 확인합니다. ({id: status_code})"""
+    return get_client().get_container_statuses(container_ids, access_token, proxies=proxies)
+
+def _wait_for_containers(container_ids, access_token, proxies=None, deadline=DEFAULT_READY_DEADLINE, cancel_event=None):
+    """컨테이너들이 FINISHED 상태가 될 때까지 대기합니다. (ERROR/EXPIRED 시 즉시 실패, cancel_event 설정 시 즉시 중단)"""
+    with get_tracer().span("wait_ready", containers=len(container_ids)):
+        get_client().wait_for_containers(container_ids, access_token, proxies=proxies, deadline=deadline, cancel_event=cancel_event)
 
 def _publish_container(api_id, creation_id, access_token, proxies=None):
-    """생성된 컨테이너를 최종적으로 게시합니다."""
-    url = f"{API_BASE_URL}/{api_id}/threads_publish"
-    data = {
-        "creation_id": creation_id,
-        "access_token": access_token
-    }
-    try:
-        response = requests.post(url, data=data, proxies=proxies, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
+    """생성된 컨테이너를 최종적으로 게시합니다. (성공 시 계정 게시 한도 사용량 반영)"""
+    with get_tracer().span("publish"):
+        result = get_client().publish_container(api_id, creation_id, access_token, proxies=proxies)
+    get_quota_tracker().record_publish(api_id)
+    return result
 
 
 # --- Public Functions ---
@@ -95,22 +63,52 @@ def check_proxy_ip(proxies=None):
     except requests.exceptions.RequestException as e:
         return False, f"IP 확인 중 오류 발생: {e}"
 
-def post_text(api_id, access_token, text, proxies=None):
-    """텍스트만 게시합니다."""
+def post_text(api_id, access_token, text, proxies=None, raise_errors=False):
+    """
+    텍스트만 게시합니다.
+    auto_publish_text로 한 번의 요청에 게시하고, 그 요청이 거부되면 컨테이너 생성 → 게시 두 단계로 다시 시도합니다.
+    raise_errors=True면 실패 시 (False, 메시지) 대신 원래 예외(GraphAPIError 등)를 그대로 발생시킵니다.
+    """
+    client = get_client()
+    if client.auto_publish_text_supported:
+        try:
+            return True, _create_text_post(api_id, access_token, text, proxies=proxies)
+        except GraphAPIError as e:
+            if not _auto_publish_rejected(e):
+                if raise_errors:
+                    raise
+                return False, f"텍스트 게시 실패: {e}"
+            if "auto_publish_text" in (e.error_message or ""):
+                client.auto_publish_text_supported = False
+            print(f"[post_text] auto_publish_text 요청이 거부되어 2단계 게시로 전환: {e.error_message}")
+        except Exception as e:
+            if raise_errors:
+                raise
+            return False, f"텍스트 게시 실패: {e}"
     try:
         container = _create_media_container(api_id, access_token, "TEXT", text=text, proxies=proxies)
         result = _publish_container(api_id, container["id"], access_token, proxies=proxies)
         return True, result
     except Exception as e:
+        if raise_errors:
+            raise
         return False, f"텍스트 게시 실패: {e}"
 
-def post_single_image(api_id, access_token, image_url, text, proxies=None):
-    """단일 이미지를 게시합니다."""
+def post_single_image(api_id, access_token, image_url, text, proxies=None, cancel_event=None, raise_errors=False):
+    """
+    단일 이미지를 게시합니다. (컨테이너가 FINISHED 상태가 된 뒤에 게시)
+    raise_errors=True면 실패 시 (False, 메시지) 대신 원래 예외를 그대로 발생시킵니다.
+    """
     try:
         container = _create_media_container(api_id, access_token, "IMAGE", text=text, image_url=image_url, proxies=proxies)
+        _wait_for_containers([container["id"]], access_token, proxies=proxies, cancel_event=cancel_event)
         result = _publish_container(api_id, container["id"], access_token, proxies=proxies)
         return True, result
+    except PublishCancelledError:
+        raise
     except Exception as e:
+        if raise_errors:
+            raise
         return False, f"단일 이미지 게시 실패: {e}"
 
 def post_carousel(api_id, access_token, image_urls, text, proxies=None):
@@ -129,18 +127,40 @@ def post_carousel(api_id, access_token, image_urls, text, proxies=None):
     except Exception as e:
         return False, f"캐러셀 게시 실패: {e}"
 
-def post_video(api_id, access_token, video_url, text, proxies=None):
-    """동영상을 게시합니다. (컨테이너 생성 후 20초 대기, 실패 시 10초 후 1회 재시도)"""
+def post_video(api_id, access_token, video_url, text, proxies=None, checkpoint=None, cancel_event=None,
+               raise_errors=False):
+    """
+    동영상을 게시합니다. (컨테이너가 FINISHED 상태가 되는 즉시 게시, 재시도 가능한 오류면 상태 재확인 후 1회 재시도)
+    checkpoint를 주면 만료 전 컨테이너 ID와 게시 결과를 저장/재사용합니다.
+    cancel_event(threading.Event)가 설정되면 대기를 멈추고 PublishCancelledError를 발생시킵니다.
+    raise_errors=True면 실패 시 (False, 메시지) 대신 원래 예외를 그대로 발생시킵니다.
+    """
     try:
-        video_container = _create_media_container(api_id, access_token, "VIDEO", text=text, video_url=video_url, proxies=proxies)
-        container_id = video_container["id"]
-        time.sleep(20)
+        if checkpoint and checkpoint.result:
+            return True, checkpoint.result
+        container_id = checkpoint.get_container() if checkpoint else None
+        if not container_id:
+            video_container = _create_media_container(api_id, access_token, "VIDEO", text=text, video_url=video_url, proxies=proxies)
+            container_id = video_container["id"]
+            if checkpoint:
+                checkpoint.set_container(container_id)
+        _wait_for_containers([container_id], access_token, proxies=proxies, cancel_event=cancel_event)
         try:
             result = _publish_container(api_id, container_id, access_token, proxies=proxies)
-            return True, result
         except Exception as e:
-            time.sleep(10)
-            result = _publish_container(api_id, container_id, access_token, proxies=proxies)
-            return True, result
+            if retry_delay(e, 0) is None:
+                raise
+            sleep_or_cancel(retry_delay(e, 0), cancel_event)
+            with get_tracer().retry_attempt(1):
+                _wait_for_containers([container_id], access_token, proxies=proxies, cancel_event=cancel_event)
+                result = _publish_container(api_id, container_id, access_token, proxies=proxies)
+        if checkpoint:
+            checkpoint.set_result(result)
+        return True, result
+    except PublishCancelledError:
+        raise
     except Exception as e:
-        return False, f"동영상 게시 실패: {e}"
\ No newline at end of file
+        discard_failed_containers(checkpoint, e)
+        if raise_errors:
+            raise
+        return False, f"동영상 게시 실패: {e}"
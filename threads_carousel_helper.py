@@ -1,143 +1,155 @@
-import requests
-import time
-
-API_BASE_URL = "https://graph.threads.net/v1.0"
-
-def _create_media_container(api_id, access_token, media_type, text=None, image_url=None, video_url=None, is_carousel_item=False, proxies=None):
-    """미디어 컨테이너(단일, 캐러셀 아이템, 비디오)를 생성합니다."""
-    url = f"{API_BASE_URL}/{api_id}/threads"
-    data = {
-        "media_type": media_type,
-        "access_token": access_token,
-    }
-    if text:
-        data["text"] = text
-    if image_url:
-        data["image_url"] = image_url
-    if video_url:
-        data["video_url"] = video_url
-    if is_carousel_item:
-        data["is_carousel_item"] = "true"
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from threads_api_helper import (
+    _create_media_container,
+    _create_carousel_container,
+    _wait_for_containers,
+    _publish_container,
+)
+from catbox_uploader import upload_file
+from publish_checkpoint import discard_failed_containers
+from publish_trace import get_tracer
+from threads_errors import PublishCancelledError, ThreadsAPIError, raise_if_cancelled, retry_delay, retry_rule_for, sleep_or_cancel
+
+
+# 캐러셀 하위 컨테이너 동시 생성(업로드 포함) 개수
+DEFAULT_MAX_PARALLEL = 5
+
+MEDIA_URL_FIELDS = {"IMAGE": "image_url", "VIDEO": "video_url"}
+VIDEO_EXTENSIONS = (".mp4", ".mov")
 
-    try:
-        response = requests.post(url, data=data, proxies=proxies, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
-
-def _create_carousel_container(api_id, access_token, children_ids, text, proxies=None):
-    """캐러셀 컨테이너를 생성합니다."""
-    url = f"{API_BASE_URL}/{api_id}/threads"
-    data = {
-        "media_type": "CAROUSEL",
-        "children": ",".join(children_ids),
-        "text": text,
-        "access_token": access_token
-    }
-    try:
-        response = requests.post(url, data=data, proxies=proxies, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
-
-
-def _get_container_status(container_id, access_token, proxies=None):
-    """미디어 컨테이너의 처리 상태를 확인합니다."""
-    url = f"{API_BASE_URL}/{container_id}"
-    params = {
-        "fields": "status_code",
-        "access_token": access_token
-    }
-    try:
-        response = requests.get(url, params=params, proxies=proxies, timeout=10)
-        response.raise_for_status()
-        return response.json().get("status_code")
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
-
-def _publish_container(api_id, creation_id, access_token, proxies=None):
-    """생성된 컨테이너를 최종적으로 게시합니다."""
-    url = f"{API_BASE_URL}/{api_id}/threads_publish"
-    data = {
-        "creation_id": creation_id,
-        "access_token": access_token
-    }
-    try:
-        response = requests.post(url, data=data, proxies=proxies, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        raise Exception(f"HTTP 오류: {e.response.status_code} - {e.response.text}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"요청 오류: {e}")
+
+def _check_media_item(item):
+    """미디어 아이템을 검사하고 대문자 media_type을 반환합니다."""
+    media_type = item.get("type", "").upper()
+    if not media_type or not (item.get("url") or item.get("path")):
+        raise ValueError("미디어 아이템은 'type'과 'url'(또는 로컬 파일 'path')을 포함해야 합니다.")
+    if media_type not in MEDIA_URL_FIELDS:
+        raise ValueError(f"지원하지 않는 미디어 타입입니다: {media_type}. 'IMAGE' 또는 'VIDEO'만 가능합니다.")
+    return media_type
+
+
+def _create_children(api_id, access_token, media_items, proxies=None, max_workers=DEFAULT_MAX_PARALLEL, checkpoint=None, cancel_event=None):
+    """
+    하위 컨테이너들을 최대 max_workers개씩 동시에 생성하고, media_items 순서대로 ID 리스트를 반환합니다.
+    'url' 대신 로컬 파일 'path'가 주어진 아이템은 Catbox 업로드가 끝나는 즉시 같은 작업 안에서 컨테이너를 만들므로,
+    다른 아이템의 업로드와 컨테이너 생성이 파이프라인처럼 겹쳐서 진행됩니다.
+    하나라도 실패하면 아직 시작하지 않은 작업은 취소하고, 진행 중인 작업은 업로드가 끝난 뒤 컨테이너를 만들지 않고 멈추며,
+    그 작업들을 기다리지 않고 해당 예외를 바로 발생시킵니다.
+    checkpoint가 있으면 이미 업로드된 URL과 만료 전 하위 컨테이너 ID는 재사용하고, 새로 만든 것은 바로 기록합니다.
+    """
+    media_types = [_check_media_item(item) for item in media_items]
+    aborted = threading.Event()  # 다른 하위 컨테이너가 실패하면 설정
+
+    def check_stop():
+        raise_if_cancelled(cancel_event)
+        if aborted.is_set():
+            raise PublishCancelledError("다른 하위 컨테이너 생성이 실패하여 중단합니다.")
+
+    def create(index):
+        check_stop()
+        if checkpoint:
+            known_id = checkpoint.get_child(index)
+            if known_id:
+                return known_id
+        item = media_items[index]
+        media_url = item.get("url") or (checkpoint.get_upload(index) if checkpoint else None)
+        if not media_url:
+            media_url = upload_file(item["path"])
+            if checkpoint:
+                checkpoint.set_upload(index, media_url)
+            check_stop()
+        args = {MEDIA_URL_FIELDS[media_types[index]]: media_url}
+        container_id = _create_media_container(api_id, access_token, media_types[index], is_carousel_item=True, proxies=proxies, **args)["id"]
+        if checkpoint:
+            checkpoint.set_child(index, container_id)
+        return container_id
+
+    children_ids = [None] * len(media_items)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(media_items))))
+    futures = {executor.submit(create, index): index for index in range(len(media_items))}
+    done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+    failed = [f for f in done if f.exception() is not None]
+    if failed:
+        aborted.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        first = min(failed, key=lambda f: futures[f])
+        raise first.exception()
+    executor.shutdown(wait=True)
+    for future, index in futures.items():
+        children_ids[index] = future.result()
+    return children_ids
+
+
+def media_items_from_files(file_paths):
+    """로컬 파일 경로 리스트를 post_carousel용 media_items로 변환합니다. (확장자로 IMAGE/VIDEO 판별)"""
+    items = []
+    for path in file_paths:
+        media_type = "VIDEO" if path.lower().endswith(VIDEO_EXTENSIONS) else "IMAGE"
+        items.append({"type": media_type, "path": path})
+    return items
 
 
 # --- Public Functions ---
 
-def post_carousel(api_id, access_token, media_items, text, proxies=None):
+def post_carousel(api_id, access_token, media_items, text, proxies=None, max_workers=DEFAULT_MAX_PARALLEL, checkpoint=None, cancel_event=None):
     """
     여러 이미지와 동영상(캐러셀)을 함께 게시합니다.
-    media_items: [{'type': 'IMAGE', 'url': '...'}, {'type': 'VIDEO', 'url': '...'}] 형태의 딕셔너리 리스트
+    media_items: [{'type': 'IMAGE', 'url': '...'}, {'type': 'VIDEO', 'path': 'C:/.../a.mp4'}] 형태의 딕셔너리 리스트
+                 ('path'로 준 로컬 파일은 업로드 후 바로 하위 컨테이너를 생성)
+    max_workers: 하위 컨테이너를 동시에 생성(업로드)할 최대 개수
+    checkpoint: publish_checkpoint.PublishCheckpoint. 주면 단계별 진행 상황을 저장하고,
+                재시도/재시작 시 마지막으로 완료된 단계부터 이어서 진행합니다.
+    cancel_event: threading.Event. 설정되면 업로드/대기 중이라도 다음 확인 시점에 PublishCancelledError로 중단합니다.
     """
     if not media_items or len(media_items) < 2:
         raise ValueError("캐러셀에는 최소 2개 이상의 미디어가 필요합니다.")
     if len(media_items) > 20:
         raise ValueError("캐러셀은 최대 20개의 미디어만 포함할 수 있습니다.")
 
-    children_ids = []
-    has_video = False
-
-    for item in media_items:
-        media_type = item.get("type", "").upper()
-        media_url = item.get("url")
-        if not media_type or not media_url:
-            raise ValueError("미디어 아이템은 'type'과 'url'을 포함해야 합니다.")
-
-        item_container_args = {"is_carousel_item": True, "proxies": proxies}
-        if media_type == "IMAGE":
-            item_container_args["image_url"] = media_url
-        elif media_type == "VIDEO":
-            item_container_args["video_url"] = media_url
-            has_video = True
-        else:
-            raise ValueError(f"지원하지 않는 미디어 타입입니다: {media_type}. 'IMAGE' 또는 'VIDEO'만 가능합니다.")
-
-        item_container = _create_media_container(api_id, access_token, media_type, **item_container_args)
-        container_id = item_container["id"]
-        children_ids.append(container_id)
-
-    # 동영상이 하나라도 있으면 충분히 대기 후 시도 + 실패 시 재시도
-    max_retries = 5
-    initial_wait = 60 if has_video else 5
-    retry_wait = 30
-    attempt = 0
-    last_exception = None
-
-    if has_video:
-        time.sleep(initial_wait)
-
-    while attempt < max_retries:
-        try:
-            carousel_container = _create_carousel_container(api_id, access_token, children_ids, text, proxies=proxies)
-            return _publish_container(api_id, carousel_container["id"], access_token, proxies=proxies)
-        except Exception as e:
-            err_msg = str(e)
-            # 하위 요소 오류(400), 미디어 없음(4279009), Invalid parameter 모두 재시도
-            if ("하위 요소" in err_msg or 'error_subcode":4279004' in err_msg or 'error_subcode":4279009' in err_msg or "Invalid parameter" in err_msg):
-                if attempt < max_retries - 1:
-                    print(f"[슬라이드] 동영상/미디어 처리 지연으로 재시도 {attempt+1}/{max_retries}회: {err_msg}")
-                    time.sleep(retry_wait)
-                    attempt += 1
-                    last_exception = e
-                    continue
-            raise e
-    # 모든 재시도 실패 시 마지막 예외 발생
-    raise last_exception 
\ No newline at end of file
+    if checkpoint and checkpoint.result:
+        print("[슬라이드] 이미 게시가 완료된 캐러셀입니다. 저장된 결과를 반환합니다.")
+        return checkpoint.result
+
+    try:
+        children_ids = _create_children(api_id, access_token, media_items, proxies=proxies, max_workers=max_workers,
+                                        checkpoint=checkpoint, cancel_event=cancel_event)
+
+        # 하위 컨테이너가 모두 FINISHED 상태가 되는 즉시 진행 (고정 대기 없음)
+        _wait_for_containers(children_ids, access_token, proxies=proxies, cancel_event=cancel_event)
+
+        max_retries = 5
+        attempt = 0
+
+        while True:
+            try:
+                # HTTP 기록에 몇 번째 재시도인지 남김
+                with get_tracer().retry_attempt(attempt):
+                    # 첫 시도에서는 체크포인트에 남은 캐러셀 컨테이너를 재사용, 재시도 시에는 새로 생성
+                    carousel_id = checkpoint.get_container() if checkpoint and attempt == 0 else None
+                    if not carousel_id:
+                        carousel_id = _create_carousel_container(api_id, access_token, children_ids, text, proxies=proxies)["id"]
+                        if checkpoint:
+                            checkpoint.set_container(carousel_id)
+                    _wait_for_containers([carousel_id], access_token, proxies=proxies, cancel_event=cancel_event)
+                    result = _publish_container(api_id, carousel_id, access_token, proxies=proxies)
+                if checkpoint:
+                    checkpoint.set_result(result)
+                return result
+            except ThreadsAPIError as e:
+                # 재시도 여부와 대기 시간은 threads_errors.RETRY_POLICY 표로 결정
+                delay = retry_delay(e, attempt)
+                if delay is None or attempt >= max_retries - 1:
+                    raise
+                rule = retry_rule_for(e)
+                print(f"[슬라이드] {rule.reason}(code={getattr(e, 'code', None)}, subcode={getattr(e, 'subcode', None)})로 "
+                      f"{delay:.0f}초 후 재시도 {attempt+1}/{max_retries}회: {e}")
+                sleep_or_cancel(delay, cancel_event)
+                attempt += 1
+                with get_tracer().retry_attempt(attempt):
+                    _wait_for_containers(children_ids, access_token, proxies=proxies, cancel_event=cancel_event)
+    except ThreadsAPIError as e:
+        # ERROR/EXPIRED 컨테이너는 체크포인트에서 지워 다음 시도에서 새로 만들게 함
+        discard_failed_containers(checkpoint, e)
+        raise
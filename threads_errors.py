@@ -0,0 +1,165 @@
+import time
+
+
+class ThreadsAPIError(Exception):
+    """Threads 게시 과정에서 발생하는 모든 API 관련 오류의 기본 클래스"""
+
+
+class GraphAPIError(ThreadsAPIError):
+    """
+    Graph API가 오류 응답을 돌려준 경우.
+    응답 본문의 error 객체를 파싱하여 code, subcode, HTTP 상태, Retry-After 값을 담습니다.
+    """
+
+    def __init__(self, http_status, body="", code=None, subcode=None, error_type=None,
+                 error_message=None, retry_after=None, fbtrace_id=None):
+        super().__init__(f"HTTP 오류: {http_status} - {body}")
+        self.http_status = http_status
+        self.body = body
+        self.code = code
+        self.subcode = subcode
+        self.error_type = error_type
+        self.error_message = error_message
+        self.retry_after = retry_after
+        self.fbtrace_id = fbtrace_id
+
+    @classmethod
+    def from_response(cls, response):
+        """requests.Response에서 GraphAPIError를 만듭니다."""
+        error = {}
+        try:
+            error = response.json().get("error") or {}
+        except ValueError:
+            pass
+        return cls(
+            response.status_code,
+            body=response.text,
+            code=error.get("code"),
+            subcode=error.get("error_subcode"),
+            error_type=error.get("type"),
+            error_message=error.get("error_user_msg") or error.get("message"),
+            retry_after=_parse_retry_after(response.headers.get("Retry-After")),
+            fbtrace_id=error.get("fbtrace_id"),
+        )
+
+
+class GraphRequestError(ThreadsAPIError):
+    """연결 실패, 타임아웃 등 응답을 받지 못한 경우"""
+
+    def __init__(self, cause):
+        super().__init__(f"요청 오류: {cause}")
+        self.cause = cause
+
+
+class ContainerStatusError(ThreadsAPIError):
+    """컨테이너가 ERROR/EXPIRED 상태이거나 제한 시간 내에 준비되지 않았을 때 발생합니다."""
+
+    def __init__(self, message, container_id=None, status=None):
+        super().__init__(message)
+        self.container_id = container_id
+        self.status = status
+
+
+class PublishCancelledError(ThreadsAPIError):
+    """작업 취소 요청(cancel_event)으로 게시를 중단한 경우. 재시도하지 않습니다."""
+
+    def __init__(self, message="게시 작업이 취소되었습니다."):
+        super().__init__(message)
+
+
+def sleep_or_cancel(seconds, cancel_event=None):
+    """seconds초 대기합니다. cancel_event가 그 사이에 설정되면 즉시 PublishCancelledError를 발생시킵니다."""
+    if cancel_event is None:
+        time.sleep(seconds)
+        return
+    if cancel_event.wait(seconds):
+        raise PublishCancelledError()
+
+
+def raise_if_cancelled(cancel_event=None):
+    if cancel_event is not None and cancel_event.is_set():
+        raise PublishCancelledError()
+
+
+def _parse_retry_after(value):
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RetryRule:
+    """재시도 여부와 대기 시간(첫 대기 backoff초, 시도마다 2배, 최대 max_backoff초)"""
+
+    def __init__(self, retryable, backoff=0.0, max_backoff=0.0, reason=""):
+        self.retryable = retryable
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.reason = reason
+
+    def delay(self, attempt, retry_after=None):
+        """attempt번째(0부터) 재시도 전 대기 시간. 서버가 Retry-After를 주면 그 값을 우선합니다."""
+        if retry_after is not None:
+            return retry_after
+        return min(self.backoff * (2 ** attempt), self.max_backoff)
+
+
+NO_RETRY = RetryRule(False, reason="재시도해도 성공할 수 없는 오류")
+
+# 토큰이 더 이상 유효하지 않음을 뜻하는 Graph 오류 코드 (190: 만료/폐기, 102: 세션 무효)
+INVALID_TOKEN_CODES = (102, 190)
+
+# (code, subcode) → 재시도 규칙. subcode가 None이면 해당 code의 기본 규칙입니다.
+RETRY_POLICY = {
+    # 미디어가 아직 처리 중이거나 찾을 수 없음 (동영상 처리 지연)
+    (100, 4279009): RetryRule(True, 5, 60, "미디어 처리 대기"),
+    (100, 4279004): RetryRule(True, 5, 60, "하위 요소 처리 대기"),
+    (100, None): NO_RETRY,                                        # Invalid parameter
+    # 일시적 서버 오류
+    (1, None): RetryRule(True, 2, 30, "알 수 없는 일시 오류"),
+    (2, None): RetryRule(True, 2, 30, "일시적인 서비스 오류"),
+    # 호출량/게시량 제한
+    (4, None): RetryRule(True, 60, 600, "앱 호출 한도 초과"),
+    (17, None): RetryRule(True, 60, 600, "사용자 호출 한도 초과"),
+    (32, None): RetryRule(True, 60, 600, "페이지 호출 한도 초과"),
+    (613, None): RetryRule(True, 60, 600, "호출 한도 초과"),
+    # 토큰/권한 문제
+    (10, None): NO_RETRY,
+    (190, None): NO_RETRY,
+    (200, None): NO_RETRY,
+}
+
+# code로 판별할 수 없을 때 HTTP 상태로 판단하는 규칙
+HTTP_STATUS_POLICY = {
+    429: RetryRule(True, 30, 600, "Too Many Requests"),
+    500: RetryRule(True, 2, 30, "서버 오류"),
+    502: RetryRule(True, 2, 30, "게이트웨이 오류"),
+    503: RetryRule(True, 5, 60, "서비스 불가"),
+    504: RetryRule(True, 5, 60, "게이트웨이 타임아웃"),
+}
+
+NETWORK_RETRY = RetryRule(True, 2, 30, "네트워크 오류")
+CONTAINER_PENDING_RETRY = RetryRule(True, 5, 60, "컨테이너 처리 지연")
+
+
+def retry_rule_for(error):
+    """예외에 해당하는 RetryRule을 RETRY_POLICY 표에서 찾아 반환합니다."""
+    if isinstance(error, GraphAPIError):
+        for key in ((error.code, error.subcode), (error.code, None)):
+            if key in RETRY_POLICY:
+                return RETRY_POLICY[key]
+        return HTTP_STATUS_POLICY.get(error.http_status, NO_RETRY)
+    if isinstance(error, GraphRequestError):
+        return NETWORK_RETRY
+    if isinstance(error, ContainerStatusError):
+        # 시간 초과(IN_PROGRESS)는 다시 기다려 볼 수 있지만 ERROR/EXPIRED는 회복되지 않습니다.
+        return CONTAINER_PENDING_RETRY if error.status == "IN_PROGRESS" else NO_RETRY
+    return NO_RETRY
+
+
+def retry_delay(error, attempt):
+    """error가 재시도 가능하면 attempt번째 재시도 전 대기 시간(초)을, 아니면 None을 반환합니다."""
+    rule = retry_rule_for(error)
+    if not rule.retryable:
+        return None
+    return rule.delay(attempt, getattr(error, "retry_after", None))
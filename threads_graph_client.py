@@ -0,0 +1,279 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from publish_trace import get_tracer
+from threads_errors import (
+    INVALID_TOKEN_CODES, ContainerStatusError, GraphAPIError, GraphRequestError, ThreadsAPIError, raise_if_cancelled,
+    retry_rule_for, sleep_or_cancel,
+)
+
+API_BASE_URL = "https://graph.threads.net/v1.0"
+
+# 기본 커넥션 풀/타임아웃 설정
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 30
+
+# 컨테이너 준비 상태 대기 설정 (초)
+READY_STATUSES = ("FINISHED", "PUBLISHED")
+FAILED_STATUSES = ("ERROR", "EXPIRED")
+DEFAULT_READY_DEADLINE = 300
+DEFAULT_POLL_INITIAL = 1.0
+DEFAULT_POLL_MAX = 15.0
+
+# Graph API 다중 ID 조회(?ids=)에 한 번에 넣을 수 있는 최대 ID 수
+MAX_IDS_PER_LOOKUP = 50
+
+
+def _proxy_key(proxies):
+    """프록시 설정을 세션 풀의 키로 변환합니다. (프록시별로 커넥션 풀 분리)"""
+    if not proxies:
+        return ()
+    return tuple(sorted((k, v) for k, v in proxies.items() if v))
+
+
+def _rejects_ids_param(error):
+    """다중 ID 조회 오류가 ids 파라미터 자체를 거부한 것인지 (code 100 + 메시지에 ids 언급)"""
+    return error.code == 100 and "ids" in (error.error_message or "").lower()
+
+
+class GraphClient:
+    """
+    Threads Graph API 공용 클라이언트.
+    프록시 설정별로 requests.Session을 하나씩 유지하여 TCP/TLS 연결을 재사용합니다.
+    """
+
+    def __init__(self, base_url=API_BASE_URL, pool_size=DEFAULT_POOL_SIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._bulk_lookup_supported = True
+        self.auto_publish_text_supported = True
+
+    def _new_session(self, proxies):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if proxies:
+            session.proxies.update(proxies)
+        return session
+
+    def session_for(self, proxies=None):
+        """프록시 설정에 해당하는 (재사용 가능한) 세션을 반환합니다."""
+        key = _proxy_key(proxies)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._new_session(proxies)
+                self._sessions[key] = session
+            return session
+
+    def close(self):
+        """열려 있는 모든 세션(커넥션 풀)을 닫습니다."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _timeout(self, read_timeout=None):
+        return (self.connect_timeout, read_timeout or self.read_timeout)
+
+    def request(self, method, path, params=None, data=None, proxies=None, timeout=None):
+        """
+        Graph API 요청을 보내고 JSON 응답을 반환합니다.
+        오류 응답은 GraphAPIError, 연결/타임아웃 오류는 GraphRequestError로 변환됩니다.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        session = self.session_for(proxies)
+        start = time.perf_counter()
+        response = None
+        try:
+            # session.proxies는 HTTP(S)_PROXY 환경 변수에 밀리므로 계정 프록시는 요청마다 직접 넘김
+            response = session.request(method, url, params=params, data=data, proxies=proxies,
+                                       timeout=self._timeout(timeout))
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            raise GraphAPIError.from_response(e.response) from e
+        except requests.exceptions.RequestException as e:
+            raise GraphRequestError(e) from e
+        finally:
+            get_tracer().record_http(
+                method, url,
+                response.status_code if response is not None else None,
+                time.perf_counter() - start,
+                bytes_sent=len(response.request.body or b"") if response is not None else 0,
+                bytes_received=len(response.content) if response is not None else 0,
+            )
+
+    def get(self, path, params=None, proxies=None, timeout=None):
+        return self.request("GET", path, params=params, proxies=proxies, timeout=timeout)
+
+    def post(self, path, data=None, proxies=None, timeout=None):
+        return self.request("POST", path, data=data, proxies=proxies, timeout=timeout)
+
+    # --- Threads 컨테이너 API ---
+
+    def create_media_container(self, api_id, access_token, media_type, text=None, image_url=None, video_url=None, is_carousel_item=False, proxies=None):
+        """미디어 컨테이너(단일, 캐러셀 아이템, 비디오)를 생성합니다."""
+        data = {
+            "media_type": media_type,
+            "access_token": access_token,
+        }
+        if text:
+            data["text"] = text
+        if image_url:
+            data["image_url"] = image_url
+        if video_url:
+            data["video_url"] = video_url
+        if is_carousel_item:
+            data["is_carousel_item"] = "true"
+        return self.post(f"{api_id}/threads", data=data, proxies=proxies)
+
+    def create_text_post(self, api_id, access_token, text, proxies=None):
+        """auto_publish_text로 컨테이너 생성과 게시를 한 번의 요청으로 처리합니다. (반환 id는 게시된 미디어 ID)"""
+        data = {
+            "media_type": "TEXT",
+            "text": text,
+            "auto_publish_text": "true",
+            "access_token": access_token
+        }
+        return self.post(f"{api_id}/threads", data=data, proxies=proxies)
+
+    def create_carousel_container(self, api_id, access_token, children_ids, text, proxies=None):
+        """캐러셀 컨테이너를 생성합니다."""
+        data = {
+            "media_type": "CAROUSEL",
+            "children": ",".join(children_ids),
+            "text": text,
+            "access_token": access_token
+        }
+        return self.post(f"{api_id}/threads", data=data, proxies=proxies)
+
+    def get_container_status(self, container_id, access_token, proxies=None):
+        """미디어 컨테이너의 처리 상태를 확인합니다."""
+        params = {
+            "fields": "status_code",
+            "access_token": access_token
+        }
+        return self.get(container_id, params=params, proxies=proxies, timeout=10).get("status_code")
+
+    def get_container_statuses(self, container_ids, access_token, proxies=None):
+        """
+        여러 컨테이너의 status_code를 다중 ID 조회(?ids=a,b,c) 한 번으로 가져와 {id: status} 딕셔너리로 반환합니다.
+        다중 조회가 거부되면 이번 호출은 컨테이너별 개별 조회로 대체하고,
+        오류가 ids 파라미터 자체를 거부한 경우에만 이후 호출도 개별 조회를 사용합니다.
+        """
+        container_ids = list(dict.fromkeys(container_ids))
+        if len(container_ids) == 1 or not self._bulk_lookup_supported:
+            return {cid: self.get_container_status(cid, access_token, proxies=proxies) for cid in container_ids}
+
+        statuses = {}
+        for start in range(0, len(container_ids), MAX_IDS_PER_LOOKUP):
+            chunk = container_ids[start:start + MAX_IDS_PER_LOOKUP]
+            params = {
+                "ids": ",".join(chunk),
+                "fields": "status_code",
+                "access_token": access_token
+            }
+            try:
+                result = self.get("", params=params, proxies=proxies, timeout=10)
+            except GraphAPIError as e:
+                if e.http_status != 400 or e.code in INVALID_TOKEN_CODES:
+                    raise
+                if _rejects_ids_param(e):
+                    print(f"[GraphClient] 다중 ID 조회가 지원되지 않아 개별 조회로 전환: {e}")
+                    self._bulk_lookup_supported = False
+                else:
+                    print(f"[GraphClient] 다중 상태 조회 실패, 이번 조회만 개별 조회로 대체: {e}")
+                for cid in container_ids[start:]:
+                    statuses[cid] = self.get_container_status(cid, access_token, proxies=proxies)
+                return statuses
+            for cid in chunk:
+                statuses[cid] = (result.get(cid) or {}).get("status_code")
+        return statuses
+
+    def wait_for_containers(self, container_ids, access_token, proxies=None, deadline=DEFAULT_READY_DEADLINE,
+                            initial_interval=DEFAULT_POLL_INITIAL, max_interval=DEFAULT_POLL_MAX, cancel_event=None):
+        """
+        모든 컨테이너가 FINISHED 상태가 될 때까지 status_code를 폴링합니다. (폴링마다 다중 ID 조회 1회)
+        폴링 간격은 initial_interval부터 max_interval까지 2배씩 늘어나며,
+        ERROR/EXPIRED 상태가 나오거나 deadline(초)을 넘기면 ContainerStatusError를 발생시킵니다.
+        상태 조회 자체가 재시도 가능한 오류(네트워크, 5xx, code 1/2 등)로 실패하면 아직 처리 중인 것으로 보고 계속 폴링하며,
+        RETRY_POLICY 표에서 재시도 불가로 분류된 오류만 즉시 발생시킵니다.
+        cancel_event(threading.Event)가 설정되면 대기 중이라도 즉시 PublishCancelledError를 발생시킵니다.
+        """
+        pending = list(dict.fromkeys(container_ids))
+        give_up_at = time.monotonic() + deadline
+        interval = initial_interval
+        while True:
+            raise_if_cancelled(cancel_event)
+            still_pending = []
+            wait = interval
+            try:
+                statuses = self.get_container_statuses(pending, access_token, proxies=proxies)
+            except ThreadsAPIError as e:
+                if not retry_rule_for(e).retryable:
+                    raise
+                print(f"[GraphClient] 컨테이너 상태 조회 실패, 다음 폴링에서 다시 확인합니다: {e}")
+                statuses = {}
+                wait = max(interval, getattr(e, "retry_after", None) or 0)
+            for container_id in pending:
+                status = statuses.get(container_id)
+                if status in FAILED_STATUSES:
+                    raise ContainerStatusError(f"컨테이너 처리 실패: {container_id} ({status})", container_id, status)
+                if status not in READY_STATUSES:
+                    still_pending.append(container_id)
+            pending = still_pending
+            if not pending:
+                return
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                raise ContainerStatusError(
+                    f"컨테이너 준비 시간 초과({deadline}초): {', '.join(pending)}", pending[0], "IN_PROGRESS")
+            sleep_or_cancel(min(wait, remaining), cancel_event)
+            interval = min(interval * 2, max_interval)
+
+    def publish_container(self, api_id, creation_id, access_token, proxies=None):
+        """생성된 컨테이너를 최종적으로 게시합니다."""
+        data = {
+            "creation_id": creation_id,
+            "access_token": access_token
+        }
+        return self.post(f"{api_id}/threads_publish", data=data, proxies=proxies)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """모든 헬퍼 모듈이 공유하는 GraphClient 인스턴스를 반환합니다."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GraphClient()
+        return _client
+
+
+def configure_client(**options):
+    """
+    공용 GraphClient를 새 설정(pool_size, connect_timeout, read_timeout, base_url)으로 교체합니다.
+    기존 커넥션 풀은 닫힙니다.
+    """
+    global _client
+    with _client_lock:
+        old = _client
+        _client = GraphClient(**options)
+    if old is not None:
+        old.close()
+    return _client
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import threading
+import time
+
+from config_store import get_store, write_json_atomic
+from threads_errors import INVALID_TOKEN_CODES, GraphAPIError, ThreadsAPIError
+from threads_graph_client import get_client
+
+TOKEN_CACHE_FILE = "token_cache.json"
+
+# 만료까지 이 시간(초)보다 적게 남으면 장기 토큰을 갱신합니다. (장기 토큰 유효기간 60일)
+DEFAULT_REFRESH_MARGIN = 7 * 24 * 60 * 60
+
+# debug_token으로 유효성을 다시 확인하는 주기(초)
+DEFAULT_CHECK_TTL = 6 * 60 * 60
+
+# 백그라운드 갱신 스레드의 점검 간격(초)
+DEFAULT_REFRESH_INTERVAL = 60 * 60
+
+_accounts_file_lock = threading.Lock()
+
+
+class InvalidTokenError(ThreadsAPIError):
+    """토큰이 만료되었거나 무효로 확인되어 업로드/컨테이너 생성 전에 게시를 거부한 경우"""
+
+    def __init__(self, api_id, reason):
+        super().__init__(f"토큰이 유효하지 않아 게시 거부: {api_id} ({reason})")
+        self.api_id = api_id
+        self.reason = reason
+
+
+def token_fingerprint(token):
+    """캐시 파일에 토큰 원문 대신 저장할 식별값"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+def update_accounts_file(path, api_id, token):
+    """accounts.json에서 api_id가 같은 계정의 token을 바꿔서 저장합니다."""
+    with _accounts_file_lock:
+        with open(path, "r", encoding="utf-8") as f:
+            accounts = json.load(f)
+        for account in accounts:
+            if account.get("api_id") == api_id:
+                account["token"] = token
+        write_json_atomic(path, accounts, indent=4)
+
+
+class TokenManager:
+    """
+    계정별 액세스 토큰 관리자.
+    debug_token/refresh_access_token 응답의 만료 시각과 유효 여부를 token_cache.json에 캐시하고,
+    만료가 가까운 장기 토큰은 백그라운드 스레드에서 미리 갱신하여 accounts.json에 반영합니다.
+    """
+
+    def __init__(self, accounts_path=None, cache_path=TOKEN_CACHE_FILE, refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 check_ttl=DEFAULT_CHECK_TTL):
+        self.accounts_path = accounts_path
+        self.refresh_margin = refresh_margin
+        self.check_ttl = check_ttl
+        self._cache = get_store(cache_path)
+        self._lock = threading.Lock()
+        self._account_locks = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _account_lock(self, api_id):
+        with self._lock:
+            return self._account_locks.setdefault(api_id, threading.Lock())
+
+    def _state(self, account):
+        """현재 토큰에 해당하는 캐시 항목. 토큰이 바뀌었으면 None."""
+        state = self._cache.get(account["api_id"])
+        if state and state.get("fingerprint") == token_fingerprint(account["token"]):
+            return state
+        return None
+
+    def _save_state(self, account, valid, expires_at=None, reason=None):
+        state = {
+            "fingerprint": token_fingerprint(account["token"]),
+            "valid": valid,
+            "expires_at": expires_at,
+            "checked_at": time.time(),
+            "reason": reason,
+        }
+        self._cache.set(account["api_id"], state)
+        return state
+
+    def inspect(self, account, proxies=None):
+        """debug_token으로 토큰의 유효 여부와 만료 시각을 확인하여 캐시합니다."""
+        token = account["token"]
+        params = {"input_token": token, "access_token": token}
+        try:
+            data = get_client().get("debug_token", params=params, proxies=proxies).get("data") or {}
+        except GraphAPIError as e:
+            if e.code in INVALID_TOKEN_CODES:
+                return self._save_state(account, False, reason=e.error_message or str(e))
+            raise
+        expires_at = data.get("expires_at") or None  # 0이면 만료 없음
+        if not data.get("is_valid", False):
+            reason = (data.get("error") or {}).get("message") or "is_valid=false"
+            return self._save_state(account, False, expires_at, reason)
+        return self._save_state(account, True, expires_at)
+
+    def refresh(self, account, proxies=None):
+        """장기 토큰을 갱신하고 새 토큰을 계정 딕셔너리와 accounts.json에 반영합니다."""
+        params = {"grant_type": "th_refresh_token", "access_token": account["token"]}
+        try:
+            result = get_client().get("refresh_access_token", params=params, proxies=proxies)
+        except GraphAPIError as e:
+            if e.code in INVALID_TOKEN_CODES:
+                return self._save_state(account, False, reason=e.error_message or str(e))
+            raise
+        account["token"] = result["access_token"]
+        expires_in = result.get("expires_in")
+        state = self._save_state(account, True, time.time() + int(expires_in) if expires_in else None)
+        if self.accounts_path:
+            update_accounts_file(self.accounts_path, account["api_id"], account["token"])
+        print(f"[Token] 토큰 갱신 완료: {account.get('username') or account['api_id']}")
+        return state
+
+    def _needs_refresh(self, state, now):
+        return state["valid"] and state["expires_at"] and state["expires_at"] - now < self.refresh_margin
+
+    def ensure_valid(self, account, proxies=None):
+        """
+        게시 전에 호출합니다. 무효로 알려진 토큰이면 InvalidTokenError를 발생시키고,
+        캐시가 오래되었으면 다시 확인하며, 만료가 임박했으면 그 자리에서 갱신합니다.
+        확인 요청 자체가 실패하면(네트워크 오류 등) 게시를 막지 않습니다.
+        """
+        with self._account_lock(account["api_id"]):
+            now = time.time()
+            state = self._state(account)
+            try:
+                if state is None or now - state["checked_at"] > self.check_ttl:
+                    state = self.inspect(account, proxies=proxies)
+                if state["valid"] and state["expires_at"] and state["expires_at"] <= now:
+                    state = self._save_state(account, False, state["expires_at"], "만료됨")
+                elif self._needs_refresh(state, now):
+                    state = self.refresh(account, proxies=proxies)
+            except ThreadsAPIError as e:
+                print(f"[Token] 토큰 확인 실패, 게시는 계속 진행합니다: {account.get('username') or account['api_id']} ({e})")
+                return account["token"]
+            if not state["valid"]:
+                raise InvalidTokenError(account["api_id"], state["reason"])
+            return account["token"]
+
+    def report_error(self, account, error):
+        """게시 중 토큰 무효 오류(code 190 등)를 받으면 이후 게시가 바로 거부되도록 기록합니다."""
+        if isinstance(error, GraphAPIError) and error.code in INVALID_TOKEN_CODES:
+            self._save_state(account, False, reason=error.error_message or str(error))
+
+    # --- 백그라운드 갱신 ---
+
+    def refresh_due(self, accounts, proxies_for=lambda account: None):
+        """모든 계정을 점검하여 확인이 오래된 토큰은 다시 확인하고, 만료가 가까운 토큰은 갱신합니다."""
+        for account in accounts:
+            if self._stop.is_set():
+                return
+            try:
+                self.ensure_valid(account, proxies=proxies_for(account))
+            except InvalidTokenError as e:
+                print(f"[Token] {e}")
+
+    def start(self, accounts, proxies_for=lambda account: None, interval=DEFAULT_REFRESH_INTERVAL):
+        """interval초마다 refresh_due를 실행하는 백그라운드 스레드를 시작합니다."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                self.refresh_due(accounts, proxies_for)
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="TokenRefresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,166 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+from config_store import write_json_atomic
+
+CACHE_FILE = "catbox_cache.json"
+
+# 캐시 정리 기준: 최대 항목 수, 최대 보관 기간(일)
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_AGE_DAYS = 30
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path):
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadCache:
+    """
+    파일 내용 해시 → Catbox URL 캐시.
+    파일 경로별 (크기, 수정 시각)을 함께 저장해 두어 변경되지 않은 파일은 해시를 다시 계산하지 않습니다.
+    캐시 적중(last_used 갱신)이나 새로 계산한 해시는 변경 표시만 해 두고, 다음 put() 또는 flush()(프로그램 종료 시)에 함께 기록합니다.
+    """
+
+    def __init__(self, path=CACHE_FILE, max_entries=DEFAULT_MAX_ENTRIES, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 60 * 60
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._paths = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+            self._paths = data.get("paths", {})
+        except Exception as e:
+            print(f"[UploadCache] 캐시 파일을 읽지 못해 새로 시작합니다: {e}")
+
+    def _save(self):
+        data = {"entries": self._entries, "paths": self._paths}
+        write_json_atomic(self.path, data, indent=2)
+        self._dirty = False
+
+    def flush(self):
+        """기록되지 않은 변경이 있으면 지금 파일에 저장합니다."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def content_hash(self, file_path):
+        """파일 해시를 반환합니다. 크기와 수정 시각이 그대로면 저장된 해시를 재사용합니다."""
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            known = self._paths.get(key)
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+            return known["sha256"]
+        sha256 = file_sha256(file_path)
+        with self._lock:
+            self._paths[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+            self._dirty = True
+        return sha256
+
+    def get(self, file_path, verify=False):
+        """캐시된 URL을 반환합니다. 없거나 만료되었거나 verify=True일 때 HEAD 확인에 실패하면 None."""
+        sha256 = self.content_hash(file_path)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if not entry or now - entry["uploaded_at"] > self.max_age:
+                return None
+            url = entry["url"]
+        if verify and not self._is_alive(url):
+            with self._lock:
+                self._entries.pop(sha256, None)
+                self._dirty = True
+            return None
+        with self._lock:
+            entry["last_used"] = now
+            self._dirty = True
+        return url
+
+    def put(self, file_path, url):
+        """업로드 결과를 캐시에 기록하고 정리 정책을 적용합니다."""
+        sha256 = self.content_hash(file_path)
+        now = time.time()
+        with self._lock:
+            self._entries[sha256] = {
+                "url": url,
+                "size": os.path.getsize(file_path),
+                "uploaded_at": now,
+                "last_used": now,
+            }
+            self._evict(now)
+            self._save()
+
+    def _evict(self, now):
+        """보관 기간이 지난 항목을 지우고, 그래도 많으면 가장 오래 쓰지 않은 항목부터 지웁니다."""
+        expired = [h for h, e in self._entries.items() if now - e["uploaded_at"] > self.max_age]
+        for sha256 in expired:
+            del self._entries[sha256]
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self._entries, key=lambda h: self._entries[h]["last_used"])[:overflow]
+            for sha256 in oldest:
+                del self._entries[sha256]
+        live = set(self._entries)
+        self._paths = {p: v for p, v in self._paths.items() if v["sha256"] in live}
+
+    @staticmethod
+    def _is_alive(url):
+        try:
+            response = requests.head(url, timeout=5, allow_redirects=True)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """공용 UploadCache 인스턴스를 반환합니다."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = UploadCache()
+        return _cache
+
+
+def configure_cache(**options):
+    """공용 UploadCache를 새 설정(path, max_entries, max_age_days)으로 교체합니다. (기존 캐시의 변경은 먼저 기록)"""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.flush()
+        _cache = UploadCache(**options)
+        return _cache
+
+
+@atexit.register
+def _flush():
+    with _cache_lock:
+        cache = _cache
+    if cache is not None:
+        cache.flush()